@@ -0,0 +1,69 @@
+"""Throughput of the singleton read path (Component.get and MyService()) depending on the number of threads.
+
+Every call reads an already existing singleton, so none of them should need the container lock: the aggregate
+throughput is expected to stay flat (bounded by the GIL) when threads are added, instead of collapsing because
+of contention on Component._lock.
+
+Usage:
+
+    python -m benchmarks.bench_concurrent_get [--calls 200000] [--threads 1 2 4 8 16]
+"""
+import argparse
+import threading
+import time
+
+from deafadder_container.MetaTemplate import Component
+
+
+class _Dependency(metaclass=Component):
+    pass
+
+
+class _MyService(metaclass=Component):
+    dependency: _Dependency
+
+
+def _run(target, thread_count: int, calls: int) -> float:
+    """Split the calls between thread_count threads and return the number of calls per second."""
+    per_thread = calls // thread_count
+    barrier = threading.Barrier(thread_count + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(per_thread):
+            target()
+
+    threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return per_thread * thread_count / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200_000, help="total number of calls for each measure")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args(argv)
+
+    _Dependency()
+    _MyService()
+
+    scenarios = {
+        "Component.get": lambda: Component.get(_MyService),
+        "MyService()": lambda: _MyService(),
+    }
+    print(f"{'scenario':<16}{'threads':>8}{'calls/s':>14}")
+    for name, target in scenarios.items():
+        for thread_count in args.threads:
+            print(f"{name:<16}{thread_count:>8}{_run(target, thread_count, args.calls):>14,.0f}")
+
+    Component.purge()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Cost of Component.get_all queries over 10k instances of a class.
+
+Each query is measured on its first call (cold: the index is used but nothing is memoized) and on the following
+calls (warm: memoized until the next registry mutation), next to the linear scan the container used to do.
+
+Usage:
+
+    python -m benchmarks.bench_get_all [--instances 10000] [--repeat 200]
+"""
+import argparse
+import re
+import time
+
+from deafadder_container.MetaTemplate import Component
+
+
+class _Handler(metaclass=Component):
+    pass
+
+
+def _linear_scan(pattern=None, names=None, tags=None):
+    """What get_all used to do: one regex match, one list lookup and one tag scan per instance."""
+    return {i.name: i.instance for i in Component._instances[_Handler].values()
+            if (re.match(pattern, i.name) if pattern is not None else False)
+            or (i.name in names if names is not None else False)
+            or (any(x in i.tags for x in tags) if tags is not None else False)}
+
+
+def _measure(function, repeat: int) -> float:
+    """Mean duration of a call, in microseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--instances", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    for i in range(args.instances):
+        _Handler(instance_name=f"tenant-{i}", tags=[f"region-{i % 10}", f"shard-{i % 100}"])
+
+    queries = {
+        "tags": dict(tags=["shard-7", "shard-42"]),
+        "names": dict(names=[f"tenant-{i}" for i in range(0, args.instances, 100)]),
+        "pattern": dict(pattern=r"tenant-99"),
+    }
+    print(f"{'query':<10}{'linear scan (us)':>18}{'cold (us)':>12}{'warm (us)':>12}")
+    for name, query in queries.items():
+        linear = _measure(lambda: _linear_scan(**query), args.repeat)
+        start = time.perf_counter()
+        Component.get_all(_Handler, **query)
+        cold = (time.perf_counter() - start) * 1e6
+        warm = _measure(lambda: Component.get_all(_Handler, **query), args.repeat)
+        print(f"{name:<10}{linear:>18,.1f}{cold:>12,.1f}{warm:>12,.1f}")
+
+    Component.purge()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Cost of the autowiring of a class with many injected fields: compiled injector vs interpreted wiring plan.
+
+The interpreted path (_AutowireMechanism.apply, still used when the injections are logged or traced) goes through
+the candidates of the wiring plan one by one, the compiled injector sets each field directly.
+
+Usage:
+
+    python -m benchmarks.bench_injector [--fields 8 24 48] [--repeat 20000]
+"""
+import argparse
+import time
+from typing import List
+
+from deafadder_container.MetaTemplate import Component, Scope, _AutowireMechanism
+
+
+def _create_class(fields: int):
+    """A Component class with fields autowired single dependencies and a list of all of them."""
+    leaves = [Component(f"_Leaf{i}", (), {"__module__": __name__}) for i in range(fields)]
+    annotations = {f"field{i}": leaf for i, leaf in enumerate(leaves)}
+    annotations["leaves"] = List[leaves[0]]
+    return Component(f"_Wide{fields}", (), {"__module__": __name__, "__annotations__": annotations}), leaves
+
+
+def _measure(function, repeat: int) -> float:
+    """Mean duration of a call, in microseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fields", type=int, nargs="+", default=[8, 24, 48])
+    parser.add_argument("--repeat", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    print(f"{'fields':<8}{'interpreted (us)':>18}{'compiled (us)':>15}{'speedup':>9}{'prototype (us)':>16}")
+    for fields in args.fields:
+        wide, leaves = _create_class(fields)
+        for leaf in leaves:
+            leaf()
+
+        def interpreted():
+            instance = object.__new__(wide)
+            _AutowireMechanism(instance, wide, "<prototype>").apply()
+
+        def compiled():
+            instance = object.__new__(wide)
+            _AutowireMechanism.inject(instance, wide, "<prototype>")
+
+        interpreted_duration = _measure(interpreted, args.repeat)
+        compiled_duration = _measure(compiled, args.repeat)
+        prototype_duration = _measure(lambda: wide(scope=Scope.PROTOTYPE), args.repeat)
+        print(f"{fields + 1:<8}{interpreted_duration:>18,.2f}{compiled_duration:>15,.2f}"
+              f"{interpreted_duration / compiled_duration:>8.1f}x{prototype_duration:>16,.2f}")
+        Component.purge()
+
+
+if __name__ == "__main__":
+    main()
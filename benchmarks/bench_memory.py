@@ -0,0 +1,85 @@
+"""Memory used by the container, measured with tracemalloc.
+
+- registered instance: memory retained per named singleton (the component itself, its registry entry and its
+  indexes), with one tag and one injected dependency
+- prototype creation: memory temporarily allocated to create a prototype with 3 injected dependencies, on top of
+  the prototype itself (what the garbage collector has to reclaim)
+
+Usage:
+
+    python -m benchmarks.bench_memory [--instances 10000]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from deafadder_container.MetaTemplate import Component, Scope
+
+
+class _Dependency1(metaclass=Component):
+    pass
+
+
+class _Dependency2(metaclass=Component):
+    pass
+
+
+class _Dependency3(metaclass=Component):
+    pass
+
+
+class _Service(metaclass=Component):
+    dependency1: _Dependency1
+    dependency2: _Dependency2
+    dependency3: _Dependency3
+
+
+class _Tenant(metaclass=Component):
+    dependency: _Dependency1
+
+
+def _registered_instance(instances: int) -> float:
+    """Bytes retained per registered named singleton."""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for i in range(instances):
+        _Tenant(instance_name=f"tenant-{i}", tags=[f"shard-{i % 100}"])
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / instances
+
+
+def _prototype_creation(repeat: int) -> float:
+    """Bytes temporarily allocated (peak minus retained) to create a prototype, best of repeat creations."""
+    _Service(scope=Scope.PROTOTYPE)  # warm-up: wiring plan and compiled injector
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        prototype = _Service(scope=Scope.PROTOTYPE)
+        after, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del prototype
+        temporary = peak - after
+        best = temporary if best is None else min(best, temporary)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--instances", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    _Dependency1()
+    _Dependency2()
+    _Dependency3()
+    print(f"registered instance: {_registered_instance(args.instances):,.0f} bytes")
+    print(f"prototype creation:  {_prototype_creation(100):,.0f} temporary bytes")
+    Component.purge()
+
+
+if __name__ == "__main__":
+    main()
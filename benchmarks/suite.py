@@ -0,0 +1,295 @@
+"""Benchmark suite of the container hot paths, with machine readable results compared against a stored baseline.
+
+Scenarios:
+
+- singleton_get / component_get / get_all / get_all_tags: lookups with 1, 100 and 10k instances of a class
+- singleton_get_frozen / component_get_frozen / get_all_frozen: the same lookups with a frozen registry
+- singleton_create: creation (and registration) of 1, 100 and 10k named instances
+- prototype_create: creation of a prototype with 3 dependencies
+- deep_graph: creation of a chain of 50 components, each one depending on the previous one
+- wide_graph: creation of a prototype with 50 autowired fields
+- concurrent_get: aggregate throughput of MyService() with 1, 4 and 16 threads (see bench_concurrent_get)
+
+Each scenario is measured several times and the best run is kept, as the other ones are only slower because of noise.
+Durations are in microseconds per operation (lower is better), throughputs in operations per second (higher is better).
+When a scenario looks slower than its baseline, its group of scenarios is measured once more and the best of the two
+runs is kept, so that a transient load of the machine doesn't show up as a regression.
+
+Usage:
+
+    python -m benchmarks.suite [--quick] [--output results.json] [--baseline benchmarks/baseline.json]
+                               [--tolerance 0.25] [--save-baseline] [--only lookup creation concurrency]
+
+The baseline is the best of two runs. The exit code is 1 when a scenario is slower than its baseline by more than the tolerance. The stored baseline depends
+on the machine it was measured on: save a new one (--save-baseline) before comparing on another machine.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List
+
+from deafadder_container.MetaTemplate import Component, Scope
+
+from benchmarks.bench_concurrent_get import _run as _run_threads
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+INSTANCE_COUNTS = (1, 100, 10_000)
+THREAD_COUNTS = (1, 4, 16)
+GRAPH_SIZE = 50
+
+
+class _Dependency1(metaclass=Component):
+    pass
+
+
+class _Dependency2(metaclass=Component):
+    pass
+
+
+class _Dependency3(metaclass=Component):
+    pass
+
+
+class _Service(metaclass=Component):
+    dependency1: _Dependency1
+    dependency2: _Dependency2
+    dependency3: _Dependency3
+
+
+def _create_dependencies():
+    _Dependency1()
+    _Dependency2()
+    _Dependency3()
+
+
+def _create_chain(size: int):
+    """Component classes where each one depends on the previous one."""
+    classes = [Component("_Chain0", (), {"__module__": __name__})]
+    for i in range(1, size):
+        classes.append(Component(f"_Chain{i}", (), {"__module__": __name__, "__annotations__": {"previous": classes[-1]}}))
+    return classes
+
+
+def _create_wide(size: int):
+    """A Component class with size autowired fields, each one of a different Component class."""
+    fields = {f"field{i}": Component(f"_Leaf{i}", (), {"__module__": __name__}) for i in range(size)}
+    return Component("_Wide", (), {"__module__": __name__, "__annotations__": fields}), list(fields.values())
+
+
+def _best(function: Callable[[], None], number: int, repeat: int) -> float:
+    """Best mean duration of a call over repeat batches of number calls, in microseconds.
+
+    As with timeit, the garbage collector is disabled while measuring, so that a collection triggered by the
+    allocations of a previous scenario isn't accounted to the current one.
+    """
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        # untimed warm-up batch: caches, lazily built structures, CPU frequency scaling
+        for _ in range(number):
+            function()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            best = min(best, (time.perf_counter() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best * 1e6
+
+
+def _names(count: int) -> List[str]:
+    return [f"tenant-{i}" for i in range(count)]
+
+
+def _lookup_scenarios(results: Dict[str, dict], number: int, repeat: int) -> None:
+    for count in INSTANCE_COUNTS:
+        _create_dependencies()
+        names = _names(count)
+        for i, name in enumerate(names):
+            _Service(instance_name=name, tags=[f"shard-{i % 100}"])
+        # cycling over a fixed set of names, so that the lookups are spread over the registry
+        sample = names[::max(1, count // 100)]
+
+        def singleton_get():
+            for name in sample:
+                _Service(name)
+
+        def component_get():
+            for name in sample:
+                Component.get(_Service, name)
+
+        results[f"singleton_get[{count}]"] = _duration(_best(singleton_get, number // len(sample) + 1, repeat) / len(sample))
+        results[f"component_get[{count}]"] = _duration(_best(component_get, number // len(sample) + 1, repeat) / len(sample))
+        results[f"get_all[{count}]"] = _duration(_best(lambda: Component.get_all(_Service), max(1, number // count), repeat))
+        results[f"get_all_tags[{count}]"] = _duration(_best(lambda: Component.get_all(_Service, tags=["shard-7"]), max(1, number // count), repeat))
+        Component.freeze()
+        results[f"singleton_get_frozen[{count}]"] = _duration(_best(singleton_get, number // len(sample) + 1, repeat) / len(sample))
+        results[f"component_get_frozen[{count}]"] = _duration(_best(component_get, number // len(sample) + 1, repeat) / len(sample))
+        results[f"get_all_frozen[{count}]"] = _duration(_best(lambda: Component.get_all(_Service), max(1, number // count), repeat))
+        Component.unfreeze()
+        Component.purge()
+
+
+def _creation_scenarios(results: Dict[str, dict], number: int, repeat: int) -> None:
+    _create_dependencies()
+    for count in INSTANCE_COUNTS:
+        names = _names(count)
+
+        def singleton_create():
+            for name in names:
+                _Service(instance_name=name)
+            Component.delete_all(_Service)
+
+        results[f"singleton_create[{count}]"] = _duration(_best(singleton_create, max(1, number // count // 10), repeat) / count)
+    results["prototype_create"] = _duration(_best(lambda: _Service(scope=Scope.PROTOTYPE), number // 10, repeat))
+    Component.purge()
+
+    chain = _create_chain(GRAPH_SIZE)
+
+    def deep_graph():
+        for component_class in chain:
+            component_class()
+        Component.purge()
+
+    results[f"deep_graph[{GRAPH_SIZE}]"] = _duration(_best(deep_graph, max(1, number // 1000), repeat))
+
+    wide, leaves = _create_wide(GRAPH_SIZE)
+    for leaf in leaves:
+        leaf()
+    results[f"wide_graph[{GRAPH_SIZE}]"] = _duration(_best(lambda: wide(scope=Scope.PROTOTYPE), max(1, number // 100), repeat))
+    Component.purge()
+
+
+def _concurrency_scenarios(results: Dict[str, dict], number: int, repeat: int) -> None:
+    _create_dependencies()
+    _Service()
+    for thread_count in THREAD_COUNTS:
+        throughput = max(_run_threads(_Service, thread_count, number * 10) for _ in range(repeat))
+        results[f"concurrent_get[{thread_count} threads]"] = {"value": throughput, "unit": "ops/s", "higher_is_better": True}
+    Component.purge()
+
+
+def _duration(microseconds: float) -> dict:
+    return {"value": microseconds, "unit": "us/op", "higher_is_better": False}
+
+
+SCENARIOS = {
+    "lookup": _lookup_scenarios,
+    "creation": _creation_scenarios,
+    "concurrency": _concurrency_scenarios,
+}
+
+
+def run(number: int = 10_000, repeat: int = 5, only: List[str] = None) -> dict:
+    """Run the scenarios and return the results along with the environment they were measured in."""
+    results: Dict[str, dict] = {}
+    for group, scenario in SCENARIOS.items():
+        if only is None or group in only:
+            group_results: Dict[str, dict] = {}
+            scenario(group_results, number, repeat)
+            for result in group_results.values():
+                result["group"] = group
+            results.update(group_results)
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "number": number,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _change(result: dict, reference: dict) -> float:
+    """Relative slowdown of result compared to reference: positive when slower, whatever the unit."""
+    if result["higher_is_better"]:
+        return reference["value"] / result["value"] - 1
+    return result["value"] / reference["value"] - 1
+
+
+def _regressions(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    references = baseline.get("results", {})
+    return [name for name, result in results["results"].items()
+            if name in references and _change(result, references[name]) > tolerance]
+
+
+def confirm(results: dict, baseline: dict, tolerance: float) -> None:
+    """Measure again the groups of the scenarios that look like regressions, keeping the best value of each scenario."""
+    groups = {results["results"][name]["group"] for name in _regressions(results, baseline, tolerance)}
+    if not groups:
+        return
+    print(f"Measuring {', '.join(sorted(groups))} again to confirm the regressions")
+    _keep_best(results, run(number=results["number"], repeat=results["repeat"], only=list(groups)))
+
+
+def _keep_best(results: dict, rerun: dict) -> None:
+    for name, result in rerun["results"].items():
+        current = results["results"][name]
+        if _change(result, current) < 0:
+            current["value"] = result["value"]
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Print the results next to the baseline and return the names of the scenarios that regressed."""
+    references = baseline.get("results", {})
+    regressions = _regressions(results, baseline, tolerance)
+    print(f"{'scenario':<32}{'baseline':>14}{'current':>14}{'change':>10}  unit")
+    for name, result in results["results"].items():
+        reference = references.get(name)
+        if reference is None:
+            print(f"{name:<32}{'-':>14}{result['value']:>14,.2f}{'-':>10}  {result['unit']}")
+            continue
+        print(f"{name:<32}{reference['value']:>14,.2f}{result['value']:>14,.2f}{_change(result, reference):>+10.0%}  "
+              f"{result['unit']}{'  REGRESSION' if name in regressions else ''}")
+    return regressions
+
+
+def _write(results: dict, path: str) -> None:
+    if path:
+        with open(path, "w") as output:
+            json.dump(results, output, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for a smoke run")
+    parser.add_argument("--only", nargs="+", choices=list(SCENARIOS), help="only run these groups of scenarios")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline to compare the results with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before reporting a regression")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run(number=1_000 if args.quick else 10_000, repeat=2 if args.quick else 5, only=args.only)
+    if args.save_baseline:
+        # a baseline measured during a transient load would hide the regressions: keep the best of two runs
+        _keep_best(results, run(number=results["number"], repeat=results["repeat"], only=args.only))
+        _write(results, args.output)
+        _write(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    confirm(results, baseline, args.tolerance)
+    _write(results, args.output)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} scenario(s) slower than the baseline by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
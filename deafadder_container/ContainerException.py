@@ -12,3 +12,23 @@ class MultipleAutowireReference(DeafAdderContainerException):
 
 class AnnotatedDeclarationMissing(DeafAdderContainerException):
     pass
+
+
+class AsyncInitializationRequired(DeafAdderContainerException):
+    pass
+
+
+class CircularDependency(DeafAdderContainerException):
+    pass
+
+
+class PoolExhausted(DeafAdderContainerException):
+    pass
+
+
+class RegistryFrozen(DeafAdderContainerException):
+    pass
+
+
+class InvalidAnnotation(DeafAdderContainerException):
+    pass
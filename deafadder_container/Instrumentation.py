@@ -0,0 +1,119 @@
+import bisect
+from threading import Lock
+from typing import Any, Dict, Tuple
+
+# counters
+GET_HITS = "get_hits"
+GET_MISSES = "get_misses"
+LOCK_CONTENTIONS = "lock_contentions"
+# histograms, in seconds
+CREATION_SECONDS = "creation_seconds"
+INIT_SECONDS = "init_seconds"
+AUTOWIRE_SECONDS = "autowire_seconds"
+POST_INIT_SECONDS = "post_init_seconds"
+LOCK_WAIT_SECONDS = "lock_wait_seconds"
+
+# upper bounds of the histogram buckets, in seconds (from 10µs to 10s)
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+class Instrumentation:
+    """Receives the metrics of the container, see Component.set_instrumentation
+
+    This base class does nothing: it is the default instrumentation, and the container doesn't even call it, so
+    that an application that doesn't need metrics doesn't pay for them. Subclass it to forward the metrics to
+    your own monitoring system.
+
+    All the metrics are reported per Component class (or per class managed with Component.of), from any thread.
+    """
+
+    def increment(self, metric: str, component_class, value: int = 1) -> None:
+        """Increment a counter: GET_HITS, GET_MISSES or LOCK_CONTENTIONS
+
+        :param metric: the name of the counter
+        :param component_class: the class the counter is reported for
+        :param value: the increment
+        """
+        pass
+
+    def observe(self, metric: str, component_class, seconds: float) -> None:
+        """Record a duration: CREATION_SECONDS (INIT_SECONDS + AUTOWIRE_SECONDS + POST_INIT_SECONDS) or LOCK_WAIT_SECONDS
+
+        :param metric: the name of the histogram
+        :param component_class: the class the duration is reported for
+        :param seconds: the duration
+        """
+        pass
+
+
+class MetricsCollector(Instrumentation):
+    """Instrumentation aggregating the metrics in memory, as counters and histograms per class
+
+    The snapshot follows the Prometheus data model (cumulative buckets, sum and count), so that it can be
+    exported as is by a custom collector or an HTTP endpoint.
+
+    InDepth:
+    --------
+
+    metrics = MetricsCollector()
+    Component.set_instrumentation(metrics)
+    ...
+    snapshot = metrics.snapshot()
+    snapshot["histograms"]["creation_seconds"]["my_app.services.Repository"]
+    # {"buckets": {0.00001: 0, ..., 10.0: 3, "+Inf": 3}, "sum": 0.0123, "count": 3}
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self._buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        # (metric, class) -> value
+        self._counters: Dict[Tuple[str, Any], int] = {}
+        # (metric, class) -> [count per bucket (the last one is +Inf), sum]
+        self._histograms: Dict[Tuple[str, Any], list] = {}
+
+    def increment(self, metric: str, component_class, value: int = 1) -> None:
+        key = (metric, component_class)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, metric: str, component_class, seconds: float) -> None:
+        key = (metric, component_class)
+        index = bisect.bisect_left(self._buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(self._buckets) + 1), 0.0]
+            histogram[0][index] += 1
+            histogram[1] += seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Current value of the metrics
+
+        :return: {"counters": {metric: {class: value}},
+                  "histograms": {metric: {class: {"buckets": {upper bound: cumulative count}, "sum": s, "count": n}}}}
+                 where the classes are given by their qualified name (module.name) and the last upper bound is "+Inf"
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(counts), total) for key, (counts, total) in self._histograms.items()}
+
+        snapshot = {"counters": {}, "histograms": {}}
+        for (metric, component_class), value in counters.items():
+            snapshot["counters"].setdefault(metric, {})[_class_label(component_class)] = value
+        for (metric, component_class), (counts, total) in histograms.items():
+            cumulative, buckets = 0, {}
+            for upper_bound, count in zip((*self._buckets, "+Inf"), counts):
+                cumulative += count
+                buckets[upper_bound] = cumulative
+            snapshot["histograms"].setdefault(metric, {})[_class_label(component_class)] = \
+                {"buckets": buckets, "sum": total, "count": cumulative}
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def _class_label(component_class) -> str:
+    return f"{component_class.__module__}.{component_class.__qualname__}"
@@ -1,19 +1,44 @@
-import _ast
+import asyncio
+import collections
+import collections.abc
+import heapq
 import inspect
-import ast
+import itertools
+import keyword
 import logging
+import os
 import re
+import sys
+import threading
+import time
+import types
 import typing
+import weakref
 
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import ContextVar
 from enum import auto, Enum
-from threading import Lock
-from typing import Any, Dict, List
+from functools import lru_cache
+from threading import Lock, RLock
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 from deafadder_container.ContainerException import InstanceNotFound, MultipleAutowireReference, \
-    AnnotatedDeclarationMissing
+    AnnotatedDeclarationMissing, AsyncInitializationRequired, CircularDependency, PoolExhausted, RegistryFrozen, \
+    InvalidAnnotation
+from deafadder_container.Instrumentation import AUTOWIRE_SECONDS, CREATION_SECONDS, GET_HITS, GET_MISSES, \
+    INIT_SECONDS, Instrumentation, LOCK_CONTENTIONS, LOCK_WAIT_SECONDS, POST_INIT_SECONDS
+from deafadder_container.Wiring import AUTOWIRE_ATTRIBUTE, Lazy, Live
 
 DEFAULT_INSTANCE_NAME = "default"
+# maximum number of distinct get_all queries memoized for each class
+QUERY_CACHE_SIZE = 256
+# the patterns of the memoized queries, compiled once
+_compile_pattern = lru_cache(maxsize=QUERY_CACHE_SIZE)(re.compile)
+
+DEFAULT_POOL_MAX_SIZE = 8
 
 log = logging.getLogger(__name__)
+# structured trace of the container operations, see Component.set_trace
+trace_log = logging.getLogger(f"{__name__}.trace")
 log.addHandler(logging.NullHandler())
 
 
@@ -25,29 +50,451 @@ class Scope(Enum):
 
     - PROTOTYPE means that the Component should not be a singleton, a new instance will be created each time we call
     the class init. However it is still treated as Component capable of autowiring and post initialization.
+
+    - THREAD means that the Component is a singleton (with different name possible) within the current thread. It is
+    not retrievable with Component.get.
+
+    - CONTEXT means that the Component is a singleton (with different name possible) within the current context scope,
+    see Component.context_scope. Without an entered context scope, each asyncio task (or thread) has its own instances.
+    It is not retrievable with Component.get.
+
+    - POOLED means that the Component instances are recycled through a bounded pool (one pool per name), see
+    Component.configure_pool. Calling the class returns a lease to use with 'with', giving an instance for the duration
+    of the block. It is not retrievable with Component.get.
     """
     SINGLETON = auto()
     PROTOTYPE = auto()
+    THREAD = auto()
+    CONTEXT = auto()
+    POOLED = auto()
+
+
+class ForkPolicy(Enum):
+    """A ForkPolicy define what happens to the singletons of a Component class in a child process created with os.fork
+    (multiprocessing with the fork start method, pre-fork servers such as gunicorn...).
+
+    - SHARE (the default) means that the child keeps the instance inherited from the parent. Its _post_fork method,
+    if any, is called in the child, to open again what can't be shared between processes (sockets, files...).
+
+    - RECREATE means that the child replaces the instance with a new one, with the same name and tags (and without any
+    __init__ argument), created once the shared instances went through their _post_fork.
+
+    - DROP means that the instance is removed from the registry of the child. It is created again on first use, as
+    after Component.delete.
+
+    The _pre_destroy of a recreated or dropped instance isn't called in the child: its resources belong to the parent.
+    The instances autowired with it keep the inherited instance, unless they are recreated as well.
+    """
+    SHARE = auto()
+    RECREATE = auto()
+    DROP = auto()
 
 
 class _NamedInstance:
-    """Used internally to represent a named component instance"""
+    """Used internally to represent a named component instance
 
-    def __init__(self, name: str, instance: any, tags: List[str] = None):
+    There is one per registered instance, so it is kept compact: slots, and tuples (the empty one being shared)
+    rather than lists.
+    """
+    __slots__ = ("name", "instance", "tags", "dependencies", "order", "last_access")
+
+    weak = False
+
+    def __init__(self, name: str, instance: any, tags: List[str] = None, dependencies: List[Tuple[Any, str]] = None):
         self.name = name
         self.instance = instance
-        self.tags = tags or []
+        self.tags = tuple(tags) if tags else ()
+        # (class, name) of the instances injected by autowiring, used to destroy the instances in the right order
+        self.dependencies = tuple(dependencies) if dependencies else ()
+        # creation order, used to return query results in the same order as the registry
+        self.order = next(_named_instance_order)
+        # last time the instance was retrieved, only maintained for the classes with an eviction policy
+        self.last_access = time.monotonic()
+
+
+_named_instance_order = itertools.count()
+
+
+class _EvictionPolicy(NamedTuple):
+    """Bounds of the singletons of a class: maximum number of instances (least recently used evicted first) and idle TTL"""
+    max_instances: Optional[int]
+    ttl: Optional[float]
+
+
+class _FrozenRegistry(NamedTuple):
+    """Read-only copy of the registry built by Component.freeze, never modified once built"""
+    # (class, instance name) -> instance
+    instances: Dict[Tuple[Any, str], Any]
+    # class -> instance name -> instance, in creation order
+    classes: Dict[Any, Dict[str, Any]]
+
+
+class _WeakNamedInstance(_NamedInstance):
+    """Named component instance only weakly referenced by the registry.
+
+    Once the instance is garbage collected, 'instance' is None and the entry is removed from the registry.
+    """
+    __slots__ = ("_actual_class", "_reference")
+
+    weak = True
+
+    def __init__(self, actual_class, name: str, instance: any, tags: List[str] = None, dependencies: List[Tuple[Any, str]] = None):
+        self._actual_class = actual_class
+        super().__init__(name, instance, tags, dependencies)
+
+    @property
+    def instance(self):
+        return self._reference()
+
+    @instance.setter
+    def instance(self, instance):
+        self._reference = weakref.ref(instance, self._collected)
+
+    def _collected(self, _):
+        Component._remove_collected(_Anchor, self._actual_class, self)
+
+
+class _LocalScope:
+    """Instances of the THREAD or CONTEXT scope created in a thread or a context scope.
+
+    Entering it (with or async with) makes it the context scope of the current context. Exiting it releases its
+    instances, calling their _pre_destroy method in reverse creation order.
+    """
+    __slots__ = ("instances", "owner", "_tokens")
+
+    def __init__(self, owner=None):
+        # (class, instance name) -> instance, in creation order
+        self.instances: Dict[Tuple[Any, str], Any] = {}
+        # weak reference to the task (or thread) of an implicit scope, None for an entered one
+        self.owner: Optional[weakref.ref] = owner
+        self._tokens = []
+
+    def release(self) -> Dict[Tuple[Any, str], Optional[BaseException]]:
+        """Remove the instances of the scope, calling their _pre_destroy method in reverse creation order.
+
+        Called from a coroutine, a coroutine _pre_destroy is only scheduled in the running event loop (see arelease).
+
+        :return: for each released instance as (class, name), the exception raised by its _pre_destroy or None
+        """
+        results = {}
+        while self.instances:
+            key, instance = self.instances.popitem()
+            try:
+                _apply_pre_destroy(instance)
+                results[key] = None
+            except Exception as error:
+                log.warning("(release) _pre_destroy of %s, %s failed: %r", key[0], key[1], error)
+                results[key] = error
+        return results
+
+    async def arelease(self) -> Dict[Tuple[Any, str], Optional[BaseException]]:
+        """Asynchronous counterpart of release, awaiting coroutine _pre_destroy in the running event loop."""
+        results = {}
+        while self.instances:
+            key, instance = self.instances.popitem()
+            try:
+                await _apply_pre_destroy_async(instance)
+                results[key] = None
+            except Exception as error:
+                log.warning("(release) _pre_destroy of %s, %s failed: %r", key[0], key[1], error)
+                results[key] = error
+        return results
+
+    def __enter__(self):
+        self._tokens.append(Component._context_scope.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        Component._context_scope.reset(self._tokens.pop())
+        self.release()
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        Component._context_scope.reset(self._tokens.pop())
+        await self.arelease()
+
+
+class _ComponentPool:
+    """Bounded pool of instances of a Component class, for the POOLED scope.
+
+    Instances are built (and autowired) once, like a prototype, then recycled: the _reset method of an instance, if
+    present, is called when it goes back to the pool. When all the instances are in use and the pool is full, acquiring
+    waits for an instance to be released.
+    """
+
+    def __init__(self, component_class, min_size: int, max_size: int, timeout: Optional[float]):
+        self.component_class = component_class
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle = collections.deque()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self._condition = threading.Condition(Lock())
+
+    def acquire(self, *args, **kwargs):
+        """Take an idle instance, or create one when the pool is not full, or wait for one to be released.
+
+        :raises: PoolExhausted exception if no instance is released within the timeout of the pool
+        """
+        with self._condition:
+            if not self.idle and self.size >= self.max_size:
+                self.waits += 1
+                start = time.perf_counter()
+                available = self._condition.wait_for(lambda: self.idle or self.size < self.max_size, self.timeout)
+                self.wait_time += time.perf_counter() - start
+                if not available:
+                    raise PoolExhausted(f"No instance of {self.component_class} released within {self.timeout}s "
+                                        f"(max size: {self.max_size})")
+            if self.idle:
+                self.hits += 1
+                return self.idle.pop()
+            self.misses += 1
+            self.size += 1
+        # the new instance is built outside of the lock, so that the other instances can be released meanwhile
+        return self._create(*args, **kwargs)
+
+    def release(self, instance) -> None:
+        """Reset the instance and put it back in the pool. An instance whose _reset fails is discarded."""
+        reset = getattr(instance, "_reset", None)
+        try:
+            if callable(reset):
+                reset()
+        except Exception as error:
+            log.warning("(pool) _reset of %s failed, discarding the instance: %r", self.component_class, error)
+            instance = None
+        with self._condition:
+            if instance is None or self.size > self.max_size:
+                self.size -= 1
+            else:
+                self.idle.append(instance)
+            self._condition.notify()
+
+    def fill(self, *args, **kwargs) -> None:
+        """Create the instances needed to reach the minimum size."""
+        while True:
+            with self._condition:
+                if self.size >= self.min_size:
+                    return
+                self.size += 1
+            instance = self._create(*args, **kwargs)
+            with self._condition:
+                self.idle.append(instance)
+                self._condition.notify()
+
+    def stats(self) -> Dict[str, float]:
+        with self._condition:
+            return {"size": self.size, "idle": len(self.idle), "in_use": self.size - len(self.idle),
+                    "hits": self.hits, "misses": self.misses, "waits": self.waits, "wait_time": self.wait_time}
+
+    def _create(self, *args, **kwargs):
+        try:
+            return self.component_class._prototype_scope_handler(*args, **kwargs)
+        except BaseException:
+            with self._condition:
+                self.size -= 1
+                self._condition.notify()
+            raise
+
+
+class _ShutdownScheduler:
+    """Destroy the instances taken out of the container by Component.shutdown, in reverse dependency order.
+
+    An instance is ready to be destroyed once all its dependents are. Each _pre_destroy runs in its own daemon
+    thread: one that times out is left running, and doesn't prevent the interpreter from exiting.
+    """
+
+    def __init__(self, entries: Dict[Tuple[Any, str], "_NamedInstance"], dependencies: Dict[Tuple[Any, str], List[Tuple[Any, str]]],
+                 timeout: Optional[float], max_workers: Optional[int]):
+        self._entries = entries
+        self._dependencies = dependencies
+        self._timeout = timeout
+        self._max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        # node -> number of its dependents not destroyed yet
+        self._remaining_dependents = {node: 0 for node in entries}
+        for node_dependencies in dependencies.values():
+            for dependency in node_dependencies:
+                self._remaining_dependents[dependency] += 1
+        self._ready = collections.deque(node for node, count in self._remaining_dependents.items() if count == 0)
+        # future of the _pre_destroy -> (node, deadline)
+        self._running: Dict[Future, Tuple[Tuple[Any, str], Optional[float]]] = {}
+        self._results: Dict[Tuple[Any, str], Optional[BaseException]] = {}
+
+    def run(self) -> Dict[Tuple[Any, str], Optional[BaseException]]:
+        while len(self._results) < len(self._entries):
+            self._start_ready()
+            if self._running:
+                self._wait_running()
+            else:
+                self._break_cycle()
+        return self._results
+
+    def _start_ready(self) -> None:
+        while self._ready and len(self._running) < self._max_workers:
+            node = self._ready.popleft()
+            deadline = time.monotonic() + self._timeout if self._timeout is not None else None
+            self._running[_run_in_daemon_thread(_apply_pre_destroy, self._entries[node].instance)] = (node, deadline)
+
+    def _wait_running(self) -> None:
+        deadlines = [deadline for _, deadline in self._running.values() if deadline is not None]
+        wait_time = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+        done, _ = wait(self._running, timeout=wait_time, return_when=FIRST_COMPLETED)
+        for future in done:
+            node, _ = self._running.pop(future)
+            self._destroyed(node, future.exception())
+        now = time.monotonic()
+        for future, (node, deadline) in list(self._running.items()):
+            if deadline is not None and deadline <= now:
+                # left running in its daemon thread
+                self._running.pop(future)
+                self._destroyed(node, TimeoutError(f"_pre_destroy did not finish within {self._timeout}s"))
+
+    def _break_cycle(self) -> None:
+        # nothing is ready nor running: only possible with a circular dependency between instances recreated since
+        node = next(node for node in self._entries if node not in self._results and self._remaining_dependents[node] > 0)
+        self._remaining_dependents[node] = 0
+        self._ready.append(node)
+
+    def _destroyed(self, node: Tuple[Any, str], error: Optional[BaseException]) -> None:
+        self._results[node] = error
+        if error is not None:
+            log.warning("(shutdown) _pre_destroy of %s, %s failed: %r", node[0], node[1], error)
+        for dependency in self._dependencies[node]:
+            self._remaining_dependents[dependency] -= 1
+            if self._remaining_dependents[dependency] == 0:
+                self._ready.append(dependency)
+
+
+def _run_in_daemon_thread(function, *args) -> Future:
+    """Run the function in a new daemon thread, which the interpreter doesn't wait for when exiting."""
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = function(*args)
+        except BaseException as error:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    threading.Thread(target=run, name="deafadder-shutdown", daemon=True).start()
+    return future
+
+
+class _PoolLease:
+    """Context manager returned by a POOLED Component class, holding an instance of the pool during the block."""
+    __slots__ = ("_pool", "_args", "_kwargs", "instance")
+
+    def __init__(self, pool: _ComponentPool, args, kwargs):
+        self._pool = pool
+        self._args = args
+        self._kwargs = kwargs
+        self.instance = None
+
+    def __enter__(self):
+        self.instance = self._pool.acquire(*self._args, **self._kwargs)
+        return self.instance
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        instance, self.instance = self.instance, None
+        self._pool.release(instance)
+
+
+def _scope_owner():
+    """The asyncio task running the caller, or its thread outside of a task."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return task if task is not None else threading.current_thread()
 
 
 class Component(type):
-    _instances: Dict[Any, List[_NamedInstance]] = {}
+    # class -> instance name -> named instance, insertion ordered so get_all keeps the creation order
+    _instances: Dict[Any, Dict[str, _NamedInstance]] = {}
+    # class -> tag -> names of the instances having the tag (dict used as an insertion ordered set)
+    _tag_index: Dict[Any, Dict[str, Dict[str, None]]] = {}
+    # class -> version, incremented on each mutation of the entries of the class
+    _class_versions: Dict[Any, int] = {}
+    # class -> (version, query -> names) memoized results of get_all, dropped when the version changes. Only the
+    # names are kept, so that the cache doesn't keep weakly referenced instances alive
+    _query_cache: Dict[Any, Tuple[int, Dict[tuple, Tuple[str, ...]]]] = {}
+    # guards the registry structures only, it is never held while user code (__init__, _post_init) is running
     _lock: Lock = Lock()
+    # (class, instance name) -> lock serializing the creation of that instance. Re-entrant so a component can
+    # create other components (or even look for itself) during its own initialization. Only weakly referenced: a
+    # lock only lives while a creation holds it, so the map doesn't grow with every name ever created
+    _creation_locks: "weakref.WeakValueDictionary[Tuple[Any, str], RLock]" = weakref.WeakValueDictionary()
+    # event loop -> (class, instance name) -> pending creation, so that concurrent coroutines share the same creation
+    _async_creations: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[Any, str], asyncio.Future]]" = weakref.WeakKeyDictionary()
+    # incremented each time a class gains its first instance or loses its last one, since it changes
+    # the result of Component.contains and so the wiring plan of classes relying on it
+    _registry_epoch: int = 0
+    # same as _registry_epoch, for each class: only the plans that checked this class have to be computed again
+    _presence_versions: Dict[Any, int] = {}
+    # instances of the THREAD scope, in the 'scope' attribute of each thread
+    _thread_scopes: threading.local = threading.local()
+    # scope holding the instances of the CONTEXT scope
+    _context_scope: "ContextVar[Optional[_LocalScope]]" = ContextVar("deafadder_context_scope", default=None)
+    # (class, instance name) -> pool of the POOLED instances
+    _pools: Dict[Tuple[Any, str], _ComponentPool] = {}
+    # (class, instance name) -> (min size, max size, timeout) of the pool, set with Component.configure_pool
+    _pool_configs: Dict[Tuple[Any, str], Tuple[int, int, Optional[float]]] = {}
+    # classes whose singletons are only weakly referenced by the registry (class MyComponent(metaclass=Component, weak=True))
+    _weak_classes = set()
+    # (class, entry) of the weakly referenced instances garbage collected while the lock was held, removed on the next mutation
+    _collected_entries = collections.deque()
+    # class -> eviction policy of its singletons (class MyComponent(metaclass=Component, max_instances=..., ttl=...))
+    _eviction_policies: Dict[Any, _EvictionPolicy] = {}
+    # class -> reason ('lru' or 'ttl') -> number of evicted instances
+    _eviction_counts: Dict[Any, Dict[str, int]] = {}
+    # receives the metrics, None (the default) when they are not collected so that the hot paths only check for None
+    _instrumentation: Optional[Instrumentation] = None
+    # emit the structured trace of the container operations on trace_log
+    _tracing: bool = False
+    # read-only copy of the registry serving the lookups while the registry is frozen, None when it is not
+    _frozen: Optional[_FrozenRegistry] = None
+    # class -> fork policy of its singletons, when it isn't ForkPolicy.SHARE (class MyComponent(metaclass=Component, fork_policy=...))
+    _fork_policies: Dict[Any, ForkPolicy] = {}
+
+    def __new__(mcs, name, bases, namespace, weak: bool = False, max_instances: int = None, ttl: float = None,
+                fork_policy: ForkPolicy = ForkPolicy.SHARE, **kwargs):
+        if max_instances is not None and max_instances < 1 or ttl is not None and ttl <= 0:
+            raise ValueError(f"Invalid eviction policy for {name}: max_instances={max_instances}, ttl={ttl}")
+        if not isinstance(fork_policy, ForkPolicy):
+            raise ValueError(f"Invalid fork policy for {name}: {fork_policy}")
+        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+        if weak:
+            mcs._weak_classes.add(cls)
+        if max_instances is not None or ttl is not None:
+            mcs._eviction_policies[cls] = _EvictionPolicy(max_instances, ttl)
+        if fork_policy is not ForkPolicy.SHARE:
+            mcs._fork_policies[cls] = fork_policy
+        return cls
+
+    def __init__(cls, name, bases, namespace, weak: bool = False, max_instances: int = None, ttl: float = None,
+                 fork_policy: ForkPolicy = ForkPolicy.SHARE, **kwargs):
+        super().__init__(name, bases, namespace, **kwargs)
+        # analyse the class once, when it is defined, instead of on each instantiation
+        _AutowireMechanism.record_init_decorators(cls)
+        _AutowireMechanism.analyse(cls)
 
     def __call__(cls, instance_name: str = DEFAULT_INSTANCE_NAME, scope: Scope = Scope.SINGLETON, tags: List[str] = None, *args, **kwargs):
         if scope == Scope.SINGLETON:
             return cls._singleton_scope_handler(instance_name, tags=tags, *args, **kwargs)
         elif scope == Scope.PROTOTYPE:
             return cls._prototype_scope_handler(*args, **kwargs)
+        elif scope == Scope.THREAD or scope == Scope.CONTEXT:
+            return cls._local_scope_handler(scope, instance_name, *args, **kwargs)
+        elif scope == Scope.POOLED:
+            return _PoolLease(cls._pool_for(cls, instance_name, *args, **kwargs), args, kwargs)
 
     def _singleton_scope_handler(cls, instance_name: str, tags: List[str] = None, *args, **kwargs):
         """Create or retrieve the correct Singleton for the given class.
@@ -61,24 +508,61 @@ class Component(type):
         :param kwargs: the kwargs of the __init__ method
         :return: a new instance of the given class or an already existing instance
         """
-        with cls._lock:
-
-            if cls not in cls._instances:
-                log.debug(f"(__call__ {cls}, {instance_name}) Component not present, initializing the entry in the instance record.")
-                cls._instances[cls] = []
-
-            if instance_name not in cls._known_instance_name_for_class(cls):
-                log.debug(f"(__call__ {cls}, {instance_name}) No instance with name '{instance_name}' found for the Component. Creating it...")
-                new_instance = super().__call__(*args, **kwargs)
-
-                _AutowireMechanism(new_instance, cls, instance_name).apply()
-
-                _apply_post_init(new_instance)
+        # Fast path: an instance is only registered once fully initialized, and dict lookups are atomic, so an
+        # existing instance can be returned without acquiring the lock. Only the creation is serialized, and the
+        # lookup is done again once the lock is acquired in case another thread created the instance meanwhile.
+        instance = cls._access_instance(cls, instance_name)
+        instrumentation = cls._instrumentation
+        if instrumentation is not None:
+            instrumentation.increment(GET_HITS if instance is not None else GET_MISSES, cls)
+        if cls._tracing:
+            _trace("get", component=cls, instance_name=instance_name, hit=instance is not None)
+        if instance is None:
+            instance = cls._create_singleton(instance_name, tags, *args, **kwargs)
+            if cls in cls._eviction_policies:
+                Component._evict(cls, cls)
+        log.debug("(__call__ %s, %s) Instance found.", cls, instance_name)
+        return instance
+
+    def _create_singleton(cls, instance_name: str, tags: List[str] = None, *args, **kwargs):
+        """Slow path of the singleton scope: create and register the instance unless another thread already did it.
+
+        Only the creation of this very (class, name) pair is serialized, so unrelated components (or other named
+        instances of the same class) can be initialized concurrently. Since a component can only be built once its
+        dependencies exist, the creation locks are acquired following the dependency graph and can't deadlock.
+        """
+        with _LockAcquisition(cls._creation_lock_for(cls, instance_name), cls):
+            with cls._lock:
+                Component._check_not_frozen("create the instance of %s with name '%s'", cls, instance_name)
+                if cls not in cls._instances:
+                    log.debug("(__call__ %s, %s) Component not present, initializing the entry in the instance record.", cls, instance_name)
+                    cls._instances[cls] = {}
+                # the instance (not the entry) is returned, so that a weakly referenced one is kept alive
+                instance = cls._get_instance_for_name(cls, instance_name)
+
+            if instance is None:
+                log.debug("(__call__ %s, %s) No instance with name '%s' found for the Component. Creating it...", cls, instance_name, instance_name)
+                new_instance, dependencies = cls._build_instance(instance_name, *args, **kwargs)
+
+                with cls._lock:
+                    # a re-entrant call during the initialization, or a concurrent Component.acreate, may already have
+                    # registered an instance
+                    instance = cls._get_instance_for_name(cls, instance_name)
+                    if instance is None:
+                        cls._register(cls, cls._new_entry(cls, instance_name, new_instance, tags, dependencies))
+                        instance = new_instance
+                if instance is not new_instance:
+                    Component._discard(cls, instance_name, new_instance)
+            return instance
 
-                cls._instances[cls].append(_NamedInstance(name=instance_name, instance=new_instance, tags=tags))
-        container_entry = cls._get_entry_for_name(cls, instance_name)
-        log.debug(f"(__call__ {cls}, {instance_name}) Instance found.")
-        return container_entry.instance
+    @staticmethod
+    def _discard(cls, instance_name: str, instance) -> None:
+        """Destroy an instance built for nothing, since another one was registered with the same name meanwhile."""
+        log.debug("(__call__ %s, %s) An instance was registered meanwhile, destroying the one just built.", cls, instance_name)
+        try:
+            _apply_pre_destroy(instance)
+        except Exception as error:
+            log.warning("(__call__) _pre_destroy of the discarded %s, %s failed: %r", cls, instance_name, error)
 
     def _prototype_scope_handler(cls, *args, **kwargs):
         """Always create a new instance of the given class.
@@ -90,11 +574,454 @@ class Component(type):
         :param kwargs: the kwargs of the __init__ method
         :return: a new instance of the given class
         """
-        with cls._lock:
+        # Nothing is registered, so no lock is needed: the wiring plan is immutable, single dependencies are read
+        # with lock free lookups and collections are copied from a snapshot taken with the registry lock.
+        return cls._build_instance("<prototype>", *args, **kwargs)[0]
+
+    def _build_instance(cls, instance_name: str, *args, **kwargs) -> Tuple[Any, List[Tuple[Any, str]]]:
+        """Build a new instance: __init__, autowiring then _post_init, timing each step when instrumented.
+
+        :return: the new instance and the (class, name) of the injected dependencies
+        """
+        instrumentation = cls._instrumentation
+        if instrumentation is None and not cls._tracing:
             new_instance = super().__call__(*args, **kwargs)
-            _AutowireMechanism(new_instance, cls, "<prototype>").apply()
+            dependencies = _AutowireMechanism.inject(new_instance, cls, instance_name)
             _apply_post_init(new_instance)
-        return new_instance
+            return new_instance, dependencies
+
+        start = time.perf_counter()
+        new_instance = super().__call__(*args, **kwargs)
+        initialized = time.perf_counter()
+        dependencies = _AutowireMechanism.inject(new_instance, cls, instance_name)
+        autowired = time.perf_counter()
+        _apply_post_init(new_instance)
+        Component._report_creation(cls, instance_name, start, initialized, autowired, time.perf_counter())
+        return new_instance, dependencies
+
+    @staticmethod
+    def _report_creation(cls, instance_name: str, start: float, initialized: float, autowired: float, end: float) -> None:
+        """Report the timings of the creation of an instance to the instrumentation and to the trace."""
+        instrumentation = Component._instrumentation
+        if instrumentation is not None:
+            instrumentation.observe(INIT_SECONDS, cls, initialized - start)
+            instrumentation.observe(AUTOWIRE_SECONDS, cls, autowired - initialized)
+            instrumentation.observe(POST_INIT_SECONDS, cls, end - autowired)
+            instrumentation.observe(CREATION_SECONDS, cls, end - start)
+        if Component._tracing:
+            _trace("create", component=cls, instance_name=instance_name, init_seconds=initialized - start,
+                   autowire_seconds=autowired - initialized, post_init_seconds=end - autowired)
+
+    def _local_scope_handler(cls, scope: Scope, instance_name: str, *args, **kwargs):
+        """Create or retrieve the instance of the given class for the current thread or context.
+
+        Only the current thread (or context) can see its scope, so, like for a prototype, no lock is needed.
+        The new instance is built the same way as a prototype.
+
+        :param scope: THREAD or CONTEXT
+        :param instance_name: the name of the instance within the scope
+        :param args: the args of the __init__ method
+        :param kwargs: the kwargs of the __init__ method
+        :return: a new instance of the given class or the instance already existing in the scope
+        """
+        instances = Component._local_scope(scope).instances
+        instance = instances.get((cls, instance_name))
+        if instance is None:
+            log.debug("(__call__ %s, %s) Creating a new instance in the %s scope.", cls, instance_name, scope.name)
+            instance = instances.setdefault((cls, instance_name), cls._prototype_scope_handler(*args, **kwargs))
+        return instance
+
+    @staticmethod
+    def _local_scope(scope: Scope) -> _LocalScope:
+        """The scope holding the THREAD or CONTEXT instances of the caller, created if needed."""
+        if scope == Scope.THREAD:
+            local_scope = getattr(Component._thread_scopes, "scope", None)
+            if local_scope is None:
+                local_scope = Component._thread_scopes.scope = _LocalScope()
+            return local_scope
+        local_scope = Component._context_scope.get()
+        if local_scope is None or (local_scope.owner is not None and local_scope.owner() is not _scope_owner()):
+            # without an entered scope, a task doesn't share the implicit scope of the task that created it
+            local_scope = _LocalScope(owner=weakref.ref(_scope_owner()))
+            Component._context_scope.set(local_scope)
+        return local_scope
+
+    @staticmethod
+    def context_scope() -> _LocalScope:
+        """Create a new scope for the CONTEXT instances, to use with 'with' or 'async with'.
+
+        Within the block (and in the asyncio tasks created from it), the CONTEXT instances are created in this scope.
+        They are released, calling their _pre_destroy method, when the block is exited.
+
+        -----------------------------------------------
+        InDepth:
+        --------
+
+        class Session(metaclass=Component):
+            database: Database
+
+            def _pre_destroy(self):
+                self.connection.close()
+
+
+        async def handle(request):
+            async with Component.context_scope():
+                session = Session(scope=Scope.CONTEXT)
+                assert Session(scope=Scope.CONTEXT) is session
+            # the session is closed
+        -----------------------------------------------
+
+        :return: a new context scope
+        """
+        return _LocalScope()
+
+    @staticmethod
+    def release_thread_scope() -> Dict[Tuple[Any, str], Optional[BaseException]]:
+        """Remove the THREAD instances of the current thread, calling their _pre_destroy method.
+
+        :return: for each released instance as (class, name), the exception raised by its _pre_destroy or None
+        """
+        return Component._local_scope(Scope.THREAD).release()
+
+    def _pool_for(cls, actual_class, instance_name: str, *args, **kwargs) -> _ComponentPool:
+        """Anchor method retrieving (or creating and filling up to its minimum size) the pool of the given instance."""
+        key = (actual_class, instance_name)
+        pool = cls._pools.get(key)
+        if pool is None:
+            with cls._lock:
+                pool = cls._pools.get(key)
+                if pool is None:
+                    min_size, max_size, timeout = cls._pool_configs.get(key, (0, DEFAULT_POOL_MAX_SIZE, None))
+                    log.debug("(__call__ %s, %s) Creating a pool of size %s to %s.", actual_class, instance_name, min_size, max_size)
+                    pool = cls._pools[key] = _ComponentPool(actual_class, min_size, max_size, timeout)
+            pool.fill(*args, **kwargs)
+        return pool
+
+    @staticmethod
+    def configure_pool(cls, instance_name: str = DEFAULT_INSTANCE_NAME, min_size: int = 0,
+                       max_size: int = DEFAULT_POOL_MAX_SIZE, timeout: float = None) -> None:
+        """Configure the pool of the POOLED instances of the given class with the given name.
+
+        -----------------------------------------------
+        InDepth:
+        --------
+
+        class Parser(metaclass=Component):
+
+            def _reset(self):
+                self.buffer.clear()
+
+
+        Component.configure_pool(Parser, min_size=2, max_size=4)
+        with Parser(scope=Scope.POOLED) as parser:
+            parser.parse(...)
+        -----------------------------------------------
+
+        :param cls: the Component class
+        :param instance_name: the name of the pool
+        :param min_size: the number of instances created with the pool
+        :param max_size: the maximum number of instances, acquiring waits for a release once they are all in use
+        :param timeout: the maximum time, in seconds, to wait for a release. A PoolExhausted exception is raised after.
+        """
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+        Component._configure_pool(_Anchor, cls, instance_name, min_size, max_size, timeout)
+
+    def _configure_pool(cls, actual_class, instance_name: str, min_size: int, max_size: int, timeout: Optional[float]) -> None:
+        """Anchor method to let static method access inner field such as lock and instance."""
+        key = (actual_class, instance_name)
+        with cls._lock:
+            cls._pool_configs[key] = (min_size, max_size, timeout)
+            pool = cls._pools.get(key)
+        if pool is not None:
+            with pool._condition:
+                pool.min_size, pool.max_size, pool.timeout = min_size, max_size, timeout
+                while pool.idle and pool.size > max_size:
+                    pool.idle.popleft()
+                    pool.size -= 1
+                pool._condition.notify_all()
+
+    @staticmethod
+    def pool_stats(cls, instance_name: str = DEFAULT_INSTANCE_NAME) -> Dict[str, float]:
+        """Statistics of the pool of the given class with the given name.
+
+        :return: a dictionary with the 'size', 'idle' and 'in_use' instance counts, the number of acquisitions served
+                 by an idle instance ('hits') or by a new one ('misses'), the number of acquisitions that had to wait
+                 for a release ('waits') and the total time spent waiting in seconds ('wait_time')
+        :raises: InstanceNotFound exception if the pool doesn't exist
+        """
+        pool = _Anchor._pools.get((cls, instance_name))
+        if pool is None:
+            raise InstanceNotFound(f"No pool found for {cls} with name '{instance_name}'")
+        return pool.stats()
+
+    def _creation_lock_for(cls, actual_class, instance_name: str) -> RLock:
+        """Retrieve (or create) the lock guarding the creation of the given instance.
+
+        The caller has to keep a reference to the lock for as long as it needs it.
+        """
+        key = (actual_class, instance_name)
+        creation_lock = cls._creation_locks.get(key)
+        if creation_lock is None:
+            # unlike for a dict, setdefault isn't atomic for a WeakValueDictionary: concurrent callers have to end up
+            # with the same lock
+            with cls._lock:
+                creation_lock = cls._creation_locks.get(key)
+                if creation_lock is None:
+                    creation_lock = cls._creation_locks[key] = RLock()
+        return creation_lock
+
+    @staticmethod
+    async def acreate(cls, instance_name: str = DEFAULT_INSTANCE_NAME, scope: Scope = Scope.SINGLETON, tags: List[str] = None, *args, **kwargs):
+        """Asynchronous counterpart of calling a Component class.
+
+        Works the same way as MyComponent(...) but awaits _post_init when it is a coroutine function. Before creating
+        the new instance, the missing dependencies that are Component classes are created concurrently (with their
+        default constructor) using asyncio.gather.
+
+        Concurrent calls for the same singleton, from the same event loop, share the same creation: the instance is
+        only built once. A concurrent synchronous creation from another thread isn't waited for (its lock can't be
+        held across an await): both instances may be built, then only one is registered and the other one is
+        destroyed with its _pre_destroy method.
+
+        -----------------------------------------------
+        InDepth:
+        --------
+
+        class Database(metaclass=Component):
+
+            async def _post_init(self):
+                self.pool = await asyncpg.create_pool(...)
+
+
+        class Repository(metaclass=Component):
+            database: Database
+
+
+        repository = await Component.acreate(Repository)
+        # Database has been created (and its pool opened) before the Repository
+        -----------------------------------------------
+
+        :param cls: the Component class to instantiate
+        :param instance_name: default value is 'default'. The name of the instance so it can be retrieved later
+        :param scope: the scope of the Component
+        :param tags: the tags of the instance (SINGLETON scope only)
+        :param args: the args of the __init__ method
+        :param kwargs: the kwargs of the __init__ method
+        :return: a new instance of the given class or an already existing instance
+        """
+        if scope == Scope.PROTOTYPE:
+            return (await Component._acreate_instance(cls, "<prototype>", *args, **kwargs))[0]
+        if scope == Scope.POOLED:
+            # the instances of a pool are built synchronously, they are expected to be cheap to recycle, not to create
+            return cls(instance_name, scope, tags, *args, **kwargs)
+        if scope == Scope.THREAD or scope == Scope.CONTEXT:
+            instances = Component._local_scope(scope).instances
+            instance = instances.get((cls, instance_name))
+            if instance is None:
+                instance = (await Component._acreate_instance(cls, instance_name, *args, **kwargs))[0]
+                instance = instances.setdefault((cls, instance_name), instance)
+            return instance
+
+        instance = cls._access_instance(cls, instance_name)
+        if instance is not None:
+            return instance
+        # checked before building the instance, its registration would fail anyway
+        Component._check_not_frozen("create the instance of %s with name '%s'", cls, instance_name)
+
+        key = (cls, instance_name)
+        creations = Component._async_creations_for_running_loop()
+        creation = creations.get(key)
+        if creation is None:
+            creation = asyncio.ensure_future(Component._acreate_singleton(cls, instance_name, tags, *args, **kwargs))
+            creations[key] = creation
+            creation.add_done_callback(lambda _: creations.pop(key, None))
+        # shielded so that a cancelled caller doesn't cancel a creation other coroutines may be waiting for
+        instance = await asyncio.shield(creation)
+        if cls in cls._eviction_policies:
+            await Component._aevict(cls, cls)
+        return instance
+
+    @staticmethod
+    async def aget(cls, instance_name: str = DEFAULT_INSTANCE_NAME):
+        """Asynchronous counterpart of Component.get
+
+        If the instance is being created by Component.acreate in the current event loop, wait for the creation to
+        finish instead of failing.
+
+        :param cls: the class for which you want its instance retrieve
+        :param instance_name: the name of the instance to retrieve
+        :return: the instance with the given name if present
+        :raises: InstanceNotFound exception if there is no instance of the given class with the given name
+        """
+        creation = Component._async_creations_for_running_loop().get((cls, instance_name))
+        if creation is not None:
+            return await asyncio.shield(creation)
+        return Component.get(cls, instance_name)
+
+    @staticmethod
+    def _async_creations_for_running_loop() -> Dict[Tuple[Any, str], asyncio.Future]:
+        loop = asyncio.get_running_loop()
+        creations = Component._async_creations.get(loop)
+        if creations is None:
+            creations = Component._async_creations.setdefault(loop, {})
+        return creations
+
+    async def _acreate_singleton(cls, instance_name: str, tags: List[str] = None, *args, **kwargs):
+        """Anchor method creating and registering a singleton from a coroutine."""
+        new_instance, dependencies = await Component._acreate_instance(cls, instance_name, *args, **kwargs)
+        with cls._lock:
+            # the instance may have been created meanwhile by a synchronous call from another thread
+            instance = cls._get_instance_for_name(cls, instance_name)
+            if instance is None:
+                cls._register(cls, cls._new_entry(cls, instance_name, new_instance, tags, dependencies))
+                instance = new_instance
+        if instance is not new_instance:
+            log.debug("(acreate %s, %s) An instance was registered meanwhile, destroying the one just built.", cls, instance_name)
+            try:
+                await _apply_pre_destroy_async(new_instance)
+            except Exception as error:
+                log.warning("(acreate) _pre_destroy of the discarded %s, %s failed: %r", cls, instance_name, error)
+        return instance
+
+    async def _acreate_instance(cls, instance_name: str, *args, **kwargs) -> Tuple[Any, List[Tuple[Any, str]]]:
+        """Anchor method building a new instance: dependencies, __init__, autowiring then awaited _post_init.
+
+        :return: the new instance and the (class, name) of the injected dependencies
+        """
+        await Component._acreate_missing_dependencies(cls)
+        start = time.perf_counter()
+        new_instance = super().__call__(*args, **kwargs)
+        initialized = time.perf_counter()
+        dependencies = _AutowireMechanism.inject(new_instance, cls, instance_name)
+        autowired = time.perf_counter()
+        await _apply_post_init_async(new_instance)
+        if cls._instrumentation is not None or cls._tracing:
+            Component._report_creation(cls, instance_name, start, initialized, autowired, time.perf_counter())
+        return new_instance, dependencies
+
+    @staticmethod
+    async def _acreate_missing_dependencies(cls) -> None:
+        """Concurrently create the missing single dependencies of the class that are Component classes."""
+        plan = _AutowireMechanism.plan_for(cls)
+        if plan is None:
+            return
+        missing = {
+            (candidate.component_class, DEFAULT_INSTANCE_NAME if candidate.is_default() else candidate.component_instance_name[0])
+            for candidate in (*plan.default_candidates, *plan.non_default_candidates)
+            if not candidate.is_collection() and not candidate.lazy and type(candidate.component_class) is Component
+        }
+        missing = [(dependency, name) for dependency, name in missing if dependency._get_entry_for_name(dependency, name) is None]
+        if missing:
+            await asyncio.gather(*(Component.acreate(dependency, instance_name=name) for dependency, name in missing))
+
+    @staticmethod
+    def bootstrap(classes_or_module, max_workers: int = None) -> Dict[Tuple[Any, str], float]:
+        """Eagerly create the default instance of the given Component classes and of their dependencies.
+
+        The autowire annotations and the autowire decorators are used to build the dependency graph of the
+        instances to create. Instances whose dependencies are all created are then initialized concurrently in a
+        thread pool, so that the slow initializations (I/O in _post_init, ...) of independent components overlap
+        instead of adding up.
+
+        -----------------------------------------------
+        InDepth:
+        --------
+
+        import my_app.services
+
+        timings = Component.bootstrap(my_app.services)
+        # every Component class defined in my_app.services now has its default instance created
+
+        Component.bootstrap([ServiceA, ServiceB])
+        -----------------------------------------------
+
+        Dependencies that are not Component classes (see Component.of) have to be registered beforehand.
+        Instances that already exist are left untouched.
+
+        :param classes_or_module: an iterable of Component classes, or a module in which case all the Component
+                                  classes defined in this module are bootstrapped
+        :param max_workers: the maximum number of threads used to create the instances
+        :return: the initialization time, in seconds, of each created instance as Dict[(class, name): time]
+        :raises: CircularDependency exception if the instances to create depend on each other
+        """
+        if isinstance(classes_or_module, types.ModuleType):
+            classes = [c for c in vars(classes_or_module).values()
+                       if type(c) is Component and c.__module__ == classes_or_module.__name__]
+        else:
+            classes = list(classes_or_module)
+
+        graph = Component._bootstrap_graph(classes)
+        dependents = {node: [] for node in graph}
+        remaining_dependencies = {}
+        for node, dependencies in graph.items():
+            remaining_dependencies[node] = len(dependencies)
+            for dependency in dependencies:
+                dependents[dependency].append(node)
+
+        timings = {}
+
+        def create(node):
+            start = time.perf_counter()
+            node[0](instance_name=node[1])
+            return node, time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="deafadder-bootstrap") as executor:
+            running = {executor.submit(create, node) for node, count in remaining_dependencies.items() if count == 0}
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # re-raise the first initialization error, the instances already being created are completed
+                    # when leaving the executor context
+                    node, elapsed = future.result()
+                    timings[node] = elapsed
+                    log.debug("(bootstrap) %s, %s created in %.6fs", node[0], node[1], elapsed)
+                    for dependent in dependents[node]:
+                        remaining_dependencies[dependent] -= 1
+                        if remaining_dependencies[dependent] == 0:
+                            running.add(executor.submit(create, dependent))
+
+        not_created = [node for node in graph if node not in timings]
+        if not_created:
+            raise CircularDependency("Unable to bootstrap the following instances because of a circular dependency: "
+                                     f"{', '.join(f'{c.__name__}({n})' for c, n in not_created)}")
+        return timings
+
+    @staticmethod
+    def _bootstrap_graph(classes: List[Any]) -> Dict[Tuple[Any, str], List[Tuple[Any, str]]]:
+        """Build the graph (class, name) -> dependencies of the instances that don't exist yet.
+
+        Collection dependencies (List[...] or Dict[str, ...]) depend on every instance of their class created by
+        the bootstrap, so that they are injected complete. Lazy and Live fields don't add any dependency.
+        """
+        single_dependencies: Dict[Tuple[Any, str], List[Tuple[Any, str]]] = {}
+        collection_dependencies: Dict[Tuple[Any, str], List[_AutowireCandidate]] = {}
+        to_visit = [(c, DEFAULT_INSTANCE_NAME) for c in classes]
+        while to_visit:
+            node = to_visit.pop()
+            if node in single_dependencies or Component._get_entry_for_name(_Anchor, *node) is not None:
+                continue
+            plan = _AutowireMechanism.plan_for(node[0])
+            candidates = (*plan.default_candidates, *plan.non_default_candidates) if plan is not None else ()
+            single_dependencies[node] = []
+            # live collections reflect later registrations, they don't have to wait for anything
+            collection_dependencies[node] = [c for c in candidates if c.is_collection() and not c.live]
+            for candidate in candidates:
+                if candidate.is_collection() or candidate.lazy or type(candidate.component_class) is not Component:
+                    continue
+                dependency = (candidate.component_class,
+                              DEFAULT_INSTANCE_NAME if candidate.is_default() else candidate.component_instance_name[0])
+                if Component._get_entry_for_name(_Anchor, *dependency) is None:
+                    single_dependencies[node].append(dependency)
+                    to_visit.append(dependency)
+
+        graph = {}
+        for node, dependencies in single_dependencies.items():
+            collected = [other for candidate in collection_dependencies[node] for other in single_dependencies
+                         if other[0] is candidate.component_class
+                         and (candidate.is_default() or other[1] in candidate.component_instance_name)]
+            graph[node] = list(dict.fromkeys([*dependencies, *collected]))
+        return graph
 
     @staticmethod
     def get(cls, instance_name: str = DEFAULT_INSTANCE_NAME):
@@ -134,9 +1061,18 @@ class Component(type):
             return Component._get(_Anchor, cls, instance_name=instance_name)
 
     def _get(cls, actual_class, instance_name: str = DEFAULT_INSTANCE_NAME):
-        """Anchor method to let static method access inner field such as lock and instance"""
-        if actual_class in cls._instances and instance_name in cls._known_instance_name_for_class(actual_class):
-            return cls._get_entry_for_name(actual_class, instance_name).instance
+        """Anchor method to let static method access inner field such as lock and instance.
+
+        Lock free: the registry is only mutated with the lock acquired and a dict lookup is atomic.
+        """
+        instance = cls._access_instance(actual_class, instance_name)
+        instrumentation = cls._instrumentation
+        if instrumentation is not None:
+            instrumentation.increment(GET_HITS if instance is not None else GET_MISSES, actual_class)
+        if cls._tracing:
+            _trace("get", component=actual_class, instance_name=instance_name, hit=instance is not None)
+        if instance is not None:
+            return instance
         else:
             raise InstanceNotFound(f"Unable to find an instance for {actual_class} with name '{instance_name}'")
 
@@ -178,34 +1114,61 @@ class Component(type):
             )
 
     def _get_all_with_lock_context(cls, actual_class, pattern: str = None, names: List[str] = None, tags: List[str] = None) -> Dict[str, Any]:
-        """Anchor method to let static method access inner field such as lock and instance."""
-        with cls._lock:
-            return Component._get_all(cls, actual_class, pattern=pattern, names=names, tags=tags)
+        """Anchor method to let static method access inner field such as lock and instance.
 
-    def _get_all(cls, actual_class, pattern: str = None, names: List[str] = None, tags: List[str] = None) -> Dict[str, Any]:
-        """Anchor method to let static method access inner field such as lock and instance."""
-        if actual_class not in cls._instances:
-            return {}
-        else:
+        While the registry is frozen, nothing can change it, so the lock isn't needed.
+        """
+        frozen = cls._frozen
+        if frozen is not None:
             if pattern is None and names is None and tags is None:
-                return {i.name: i.instance for i in cls._instances[actual_class]}
-            else:
-                return {i.name: i.instance for i in cls._instances[actual_class]
-                        if cls._name_match_pattern(i.name, pattern)
-                        or cls._name_in_wanted_name_list(i.name, names)
-                        or cls._tag_in_anted_tag_list(i.tags, tags)}
+                return dict(frozen.classes.get(actual_class, {}))
+            return Component._get_all(cls, actual_class, pattern=pattern, names=names, tags=tags, memoize=False)
+        with cls._lock:
+            cls._remove_collected_entries()
+            return Component._get_all(cls, actual_class, pattern=pattern, names=names, tags=tags)
 
-    @staticmethod
-    def _name_match_pattern(name: str, pattern: str = None) -> bool:
-        return re.match(pattern, name) if pattern is not None else False
+    def _get_all(cls, actual_class, pattern: str = None, names: List[str] = None, tags: List[str] = None,
+                 memoize: bool = True) -> Dict[str, Any]:
+        """Anchor method to let static method access inner field such as lock and instance.
 
-    @staticmethod
-    def _name_in_wanted_name_list(name: str, name_list: List[str] = None):
-        return name in name_list if name_list is not None else False
-
-    @staticmethod
-    def _tag_in_anted_tag_list(instance_tags: List[str], wanted_tags: List[str] = None) -> bool:
-        return any(x in instance_tags for x in wanted_tags) if wanted_tags is not None else False
+        Filtered queries are memoized per class until the next mutation of the instances of this class. The memo is
+        shared, so it is only used with the lock held: the lock-free reads of a frozen registry don't memoize.
+        """
+        entries = cls._instances.get(actual_class)
+        if not entries:
+            return {}
+        if pattern is None and names is None and tags is None:
+            return _instances_of(entries.values())
+        if not memoize:
+            matched = cls._query(actual_class, entries, pattern=pattern, names=names, tags=tags)
+            return _instances_of(entries[name] for name in matched)
+
+        version = cls._class_versions.get(actual_class, 0)
+        cached = cls._query_cache.get(actual_class)
+        if cached is None or cached[0] != version:
+            cached = (version, {})
+            cls._query_cache[actual_class] = cached
+        queries = cached[1]
+
+        key = (pattern, tuple(names) if names is not None else None, tuple(tags) if tags is not None else None)
+        matched = queries.get(key)
+        if matched is None:
+            matched = cls._query(actual_class, entries, pattern=pattern, names=names, tags=tags)
+            if len(queries) >= QUERY_CACHE_SIZE:
+                queries.pop(next(iter(queries)))
+            queries[key] = matched
+        return _instances_of(entries[name] for name in matched)
+
+    def _query(cls, actual_class, entries: Dict[str, _NamedInstance], pattern: str = None, names: List[str] = None,
+               tags: List[str] = None) -> Tuple[str, ...]:
+        """Instances whose name matches the pattern, or is in the names, or that have one of the tags."""
+        matched = cls._names_for_tags(actual_class, tags)
+        if names is not None:
+            matched.update(name for name in names if name in entries)
+        if pattern is not None:
+            compiled_pattern = _compile_pattern(pattern)
+            matched.update(name for name in entries if compiled_pattern.match(name))
+        return tuple(sorted(matched, key=lambda n: entries[n].order))
 
     @staticmethod
     def delete(cls, instance_name: str = DEFAULT_INSTANCE_NAME):
@@ -230,10 +1193,10 @@ class Component(type):
 
         :param cls: the class you want to delete an entry from
         :param instance_name: the name of the instance to delete
-        :return:  Nothing
+        :return: the deleted instance
         :raises: InstanceNotFound exception if there is no instance of the given class with the given name
         """
-        Component._delete_with_lock_context(
+        return Component._delete_with_lock_context(
             cls if type(cls) is Component else _Anchor,
             cls, instance_name=instance_name
         )
@@ -241,18 +1204,18 @@ class Component(type):
     def _delete_with_lock_context(cls, actual_class, instance_name: str = DEFAULT_INSTANCE_NAME):
         """Anchor method to let static method access inner field such as lock and instance."""
         with cls._lock:
-            Component._delete(cls, actual_class, instance_name=instance_name)
+            return Component._delete(cls, actual_class, instance_name=instance_name)
 
     def _delete(cls, actual_class, instance_name: str = DEFAULT_INSTANCE_NAME):
         """Anchor method to let static method access inner field such as lock and instance."""
-        if actual_class in cls._instances and instance_name in cls._known_instance_name_for_class(actual_class):
-            log.debug(f"(delete {actual_class}, {instance_name}) Deleting instance")
-            cls._instances[actual_class] = list(filter(lambda i: i.name != instance_name, cls._instances[actual_class]))
+        if cls._get_entry_for_name(actual_class, instance_name) is not None:
+            log.debug("(delete %s, %s) Deleting instance", actual_class, instance_name)
+            return cls._unregister(actual_class, instance_name).instance
         else:
             raise InstanceNotFound(f"Unable to find an instance for {actual_class} with name '{instance_name}'")
 
     @staticmethod
-    def delete_all(cls, pattern: str = None, names: List[str] = None, tags: List[str] = None) -> None:
+    def delete_all(cls, pattern: str = None, names: List[str] = None, tags: List[str] = None) -> Dict[str, Any]:
         """Remove all instance of the given Component from the possible references.
 
         -----------------------------------------------
@@ -272,28 +1235,31 @@ class Component(type):
         This is mostly for test purpose. Since there is very few use case that could need this
         deletion feature in real world scenario.
 
-        :return: Nothing
+        The deleted instances are returned, so that the caller can release their resources (possibly in parallel).
+
+        :param cls: the class you want to delete entries from
+        :param pattern: a regex that describe the names of the instances you want to delete
+        :param names: the list of names of the instances you want to delete
+        :param tags: a list of tags that the instances you want to delete contains
+        :return: the deleted instances as Dict[name:instance]
         """
         if type(cls) is Component:
-            Component._delete_all(cls, cls, pattern=pattern, names=names, tags=tags)
+            return Component._delete_all(cls, cls, pattern=pattern, names=names, tags=tags)
         else:
-            Component._delete_all(_Anchor, cls, pattern=pattern, names=names, tags=tags)
+            return Component._delete_all(_Anchor, cls, pattern=pattern, names=names, tags=tags)
 
-    def _delete_all(cls, actual_class, pattern: str = None, names: List[str] = None, tags: List[str] = None) -> None:
+    def _delete_all(cls, actual_class, pattern: str = None, names: List[str] = None, tags: List[str] = None) -> Dict[str, Any]:
         """Anchor method to let static method access inner field such as lock and instance."""
         with cls._lock:
             instances = cls._get_all(actual_class, pattern=pattern, names=names, tags=tags)
 
             if not instances:
-                log.debug(f"(delete_all) Nothing to do. No instance found for class {actual_class}")
+                log.debug("(delete_all) Nothing to do. No instance found for class %s", actual_class)
             else:
-                log.debug(f"(delete_all) Deleting entries for {actual_class}.")
-                deleted_classes_string = str(instances.keys())
-                for key in instances:
-                    Component._delete(cls, actual_class, instance_name=key)
-                if not cls._instances[actual_class]:
-                    cls._instances.pop(actual_class)
-                log.debug(f"(delete_all) Entries deleted: {deleted_classes_string}")
+                log.debug("(delete_all) Deleting entries for %s.", actual_class)
+                cls._unregister_many(actual_class, instances)
+                log.debug("(delete_all) Entries deleted: %s", instances.keys())
+            return instances
 
     @staticmethod
     def purge():
@@ -306,9 +1272,9 @@ class Component(type):
         This is mostly for test purpose. Since there is very few use case that could need this
         deletion feature in real world scenario.
 
-        :return: Nothing
+        :return: the deleted instances as Dict[class:Dict[name:instance]]
         """
-        Component._purge(_Anchor)
+        return Component._purge(_Anchor)
 
     def _purge(cls):
         """Inner function to remove all instance from the dict.
@@ -319,37 +1285,533 @@ class Component(type):
         Anchor method to let static method access inner field such as lock and instance.
         """
         with cls._lock:
-            keys = [k for k, v in cls._instances.items()]
-            log.debug(f"(purge) Deleting all instances for the following Component: {keys}")
-            for k in keys:
-                cls._instances.pop(k)
+            return {k: _instances_of(entries.values()) for k, entries in Component._clear_registry(cls).items() if entries}
+
+    @staticmethod
+    def _clear_registry(cls) -> Dict[Any, Dict[str, _NamedInstance]]:
+        """Empty every registry structure, returning the removed entries. Must be called with the lock held."""
+        Component._check_not_frozen("remove all the instances")
+        removed = dict(cls._instances)
+        log.debug("(purge) Deleting all instances for the following Component: %s", removed.keys())
+        for k in removed:
+            cls._class_versions[k] = cls._class_versions.get(k, 0) + 1
+            Component._bump_registry_epoch(k)
+            if cls._tracing:
+                _trace("remove", component=k, instance_names=list(removed[k]))
+        cls._instances.clear()
+        cls._tag_index.clear()
+        cls._query_cache.clear()
+        cls._pools.clear()
+        cls._eviction_counts.clear()
+        return removed
+
+    @staticmethod
+    def shutdown(timeout: float = None, max_workers: int = None) -> Dict[Tuple[Any, str], Optional[BaseException]]:
+        """Remove all instances, calling their _pre_destroy method in reverse dependency order.
+
+        An instance is destroyed only once all the instances it has been injected into (by autowiring) are
+        destroyed, so a component can still use its dependencies in its _pre_destroy. Lazy and Live fields don't
+        order the shutdown. Independent instances are destroyed concurrently.
+
+        Each _pre_destroy runs in a daemon thread, so that one that doesn't finish (see timeout) doesn't prevent the
+        interpreter from exiting. A _pre_destroy coroutine function is run in its own event loop: use Component.ashutdown for resources bound
+        to the running event loop.
+
+        -----------------------------------------------
+        InDepth:
+        --------
+
+        class Database(metaclass=Component):
+
+            def _pre_destroy(self):
+                self.pool.close()
+
+
+        class Repository(metaclass=Component):
+            database: Database
+
+            def _pre_destroy(self):
+                self.database.pool.execute("...")  # the database is not closed yet
+
+
+        Component.shutdown(timeout=5)
+        -----------------------------------------------
+
+        :param timeout: the maximum time, in seconds, given to each _pre_destroy. An instance whose _pre_destroy
+                        takes longer is considered destroyed so that the shutdown can move on.
+        :param max_workers: the maximum number of _pre_destroy running at the same time (the ones that timed out
+                            aside), min(32, cpu count + 4) by default
+        :return: for each destroyed instance as (class, name), the exception raised by its _pre_destroy or None
+        """
+        entries = Component._take_all_for_shutdown(_Anchor)
+        return _ShutdownScheduler(entries, Component._shutdown_dependencies(entries), timeout, max_workers).run()
+
+    @staticmethod
+    async def ashutdown(timeout: float = None) -> Dict[Tuple[Any, str], Optional[BaseException]]:
+        """Asynchronous counterpart of Component.shutdown
+
+        Coroutine _pre_destroy methods are awaited in the running event loop and the synchronous ones are run in
+        daemon threads (not in the default executor of the loop, that asyncio.run waits for when exiting).
+        Independent instances are destroyed concurrently.
+
+        :param timeout: the maximum time, in seconds, given to each _pre_destroy
+        :return: for each destroyed instance as (class, name), the exception raised by its _pre_destroy or None
+        """
+        entries = Component._take_all_for_shutdown(_Anchor)
+        dependencies = Component._shutdown_dependencies(entries)
+        dependents: Dict[Tuple[Any, str], List[Tuple[Any, str]]] = {node: [] for node in entries}
+        for node, node_dependencies in dependencies.items():
+            for dependency in node_dependencies:
+                dependents[dependency].append(node)
+
+        order = Component._reverse_topological_order(entries, dependents)
+        position = {node: index for index, node in enumerate(order)}
+        destructions: Dict[Tuple[Any, str], asyncio.Future] = {}
+
+        async def destroy(node) -> Optional[BaseException]:
+            # a dependent placed after the node can only come from a circular dependency, it is not waited for
+            await asyncio.gather(*(destructions[d] for d in dependents[node] if position[d] < position[node]), return_exceptions=True)
+            try:
+                await asyncio.wait_for(_apply_pre_destroy_async(entries[node].instance), timeout)
+            except asyncio.TimeoutError:
+                return TimeoutError(f"_pre_destroy did not finish within {timeout}s")
+            except Exception as error:
+                log.warning("(shutdown) _pre_destroy of %s, %s failed: %r", node[0], node[1], error)
+                return error
+            return None
+
+        for node in order:
+            destructions[node] = asyncio.ensure_future(destroy(node))
+        results = await asyncio.gather(*destructions.values())
+        return dict(zip(destructions, results))
+
+    def _take_all_for_shutdown(cls) -> Dict[Tuple[Any, str], _NamedInstance]:
+        """Anchor method removing every instance from the container, returning their entries."""
+        with cls._lock:
+            removed = Component._clear_registry(cls)
+        return {(actual_class, name): named_instance
+                for actual_class, class_entries in removed.items()
+                for name, named_instance in class_entries.items()}
+
+    @staticmethod
+    def _shutdown_dependencies(entries: Dict[Tuple[Any, str], _NamedInstance]) -> Dict[Tuple[Any, str], List[Tuple[Any, str]]]:
+        """Recorded dependencies of each entry, restricted to the entries being destroyed."""
+        return {node: [d for d in dict.fromkeys(entry.dependencies) if d in entries and d != node]
+                for node, entry in entries.items()}
+
+    @staticmethod
+    def _reverse_topological_order(entries, dependents) -> List[Tuple[Any, str]]:
+        """Order the nodes so that each node comes after all its dependents (cycles are broken arbitrarily)."""
+        ordered: Dict[Tuple[Any, str], None] = {}
+        visiting = set()
+
+        def visit(node):
+            if node in ordered or node in visiting:
+                return
+            visiting.add(node)
+            for dependent in dependents[node]:
+                visit(dependent)
+            ordered[node] = None
+
+        for node in entries:
+            visit(node)
+        return list(ordered)
 
     @staticmethod
-    def of(instance, instance_name: str = DEFAULT_INSTANCE_NAME):
+    def of(instance, instance_name: str = DEFAULT_INSTANCE_NAME, weak: bool = False):
         """Create a Component out of a simple instance
 
         :param instance: the instance you want to convert to Component
         :param instance_name: the name of the instance you want to create
+        :param weak: only keep a weak reference to the instance, so that it is removed from the registry once it is
+                     not referenced anywhere else
         :return: the instance passed as parameter, but as a Component
         """
-        return Component._of(_Anchor, instance.__class__, instance, instance_name)
+        return Component._of(_Anchor, instance.__class__, instance, instance_name, weak)
 
-    def _of(cls, normal_class, instance, instance_name: str = DEFAULT_INSTANCE_NAME):
+    def _of(cls, normal_class, instance, instance_name: str = DEFAULT_INSTANCE_NAME, weak: bool = False):
         """Anchor method to let static method access inner field such as lock and instance."""
         with cls._lock:
+            existing_instance = cls._get_instance_for_name(normal_class, instance_name)
+            if existing_instance is not None:
+                return existing_instance
+            # checked before adding the entry of the class, so a frozen registry is left untouched
+            Component._check_not_frozen("register an instance of %s with name '%s'", normal_class, instance_name)
+            # built before adding the entry of the class as well, it fails for an instance that can't be weakly referenced
+            named_instance = cls._new_entry(normal_class, instance_name, instance, weak=weak)
             if normal_class not in cls._instances:
-                log.debug(f"(of) no entry for class {normal_class} found, adding the entry to the collection of instances.")
-                cls._instances[normal_class] = []
-            if instance_name not in cls._known_instance_name_for_class(normal_class):
-                cls._instances[normal_class].append(_NamedInstance(instance_name, instance))
-                log.debug(f"(of) instance with name '{instance_name}', created.")
-            return cls._get_entry_for_name(normal_class, instance_name).instance
+                log.debug("(of) no entry for class %s found, adding the entry to the collection of instances.", normal_class)
+                cls._instances[normal_class] = {}
+            cls._register(normal_class, named_instance)
+            log.debug("(of) instance with name '%s', created.", instance_name)
+            return instance
+
+    @staticmethod
+    def evict(cls) -> Dict[str, Any]:
+        """Apply the eviction policy of the given class, calling the _pre_destroy method of the evicted instances.
+
+        The policy is applied each time an instance of the class is created, and an expired instance is evicted when
+        accessed, so this is only needed to evict the idle instances of a class that doesn't create instances anymore.
+
+        -----------------------------------------------
+        InDepth:
+        --------
+
+        class TenantClient(metaclass=Component, max_instances=100, ttl=300):
+
+            def _pre_destroy(self):
+                self.session.close()
 
-    def _known_instance_name_for_class(cls, actual_class) -> List[str]:
-        return [i.name for i in cls._instances[actual_class]]
 
-    def _get_entry_for_name(cls, actual_class, instance_name) -> _NamedInstance:
-        return next(filter(lambda i: i.name == instance_name, cls._instances[actual_class]))
+        client = TenantClient(instance_name=tenant_id)
+        ...
+        Component.evict(TenantClient)
+        -----------------------------------------------
+
+        :param cls: the Component class declaring an eviction policy
+        :return: the evicted instances as Dict[name:instance]
+        """
+        return Component._evict(cls, cls)
+
+    def _evict(cls, actual_class) -> Dict[str, Any]:
+        """Anchor method evicting the expired and least recently used instances of the class."""
+        # the instances are destroyed once the lock is released, the registry doesn't wait for them
+        evicted_instances = cls._evict_entries(actual_class)
+        for name, instance in evicted_instances.items():
+            try:
+                _apply_pre_destroy(instance)
+            except Exception as error:
+                log.warning("(evict) _pre_destroy of %s, %s failed: %r", actual_class, name, error)
+        return evicted_instances
+
+    async def _aevict(cls, actual_class) -> Dict[str, Any]:
+        """Asynchronous counterpart of _evict, awaiting coroutine _pre_destroy in the running event loop."""
+        evicted_instances = cls._evict_entries(actual_class)
+        for name, instance in evicted_instances.items():
+            try:
+                await _apply_pre_destroy_async(instance)
+            except Exception as error:
+                log.warning("(evict) _pre_destroy of %s, %s failed: %r", actual_class, name, error)
+        return evicted_instances
+
+    def _evict_entries(cls, actual_class) -> Dict[str, Any]:
+        """Remove the expired and least recently used instances of the class from the registry, and return them."""
+        policy = cls._eviction_policies.get(actual_class)
+        if policy is None:
+            return {}
+        now = time.monotonic()
+        with cls._lock:
+            entries = cls._instances.get(actual_class) or {}
+            expired = [name for name, entry in entries.items() if policy.ttl is not None and now - entry.last_access > policy.ttl]
+            overflow = len(entries) - len(expired) - (policy.max_instances or len(entries))
+            least_recently_used = []
+            if overflow > 0:
+                expired_names = set(expired)
+                remaining = (entry for name, entry in entries.items() if name not in expired_names)
+                least_recently_used = [entry.name for entry in heapq.nsmallest(overflow, remaining, key=lambda e: e.last_access)]
+            if not expired and not least_recently_used:
+                return {}
+            log.debug("(evict %s) Evicting expired instances %s and least recently used ones %s", actual_class, expired, least_recently_used)
+            if cls._tracing:
+                _trace("evict", component=actual_class, expired=expired, least_recently_used=least_recently_used)
+            evicted = cls._unregister_many(actual_class, [*expired, *least_recently_used])
+            counts = cls._eviction_counts.setdefault(actual_class, {"lru": 0, "ttl": 0})
+            counts["ttl"] += len(expired)
+            counts["lru"] += len(least_recently_used)
+        return _instances_of(evicted.values())
+
+    @staticmethod
+    def eviction_stats(cls) -> Dict[str, int]:
+        """Number of instances of the given class ('size') and of instances evicted because they were the least
+        recently used ones ('lru') or idle for too long ('ttl')."""
+        counts = _Anchor._eviction_counts.get(cls, {})
+        return {"size": len(_Anchor._instances.get(cls) or {}), "lru": counts.get("lru", 0), "ttl": counts.get("ttl", 0)}
+
+    @staticmethod
+    def set_instrumentation(instrumentation: Optional[Instrumentation]) -> None:
+        """Report the metrics of the container to the given instrumentation
+
+        The metrics are reported per class: get hits and misses (Component.get and singleton lookups), the time
+        spent in __init__, autowiring and _post_init when creating an instance, and the contention on the creation
+        locks. By default (or with None), no metric is collected and the container doesn't pay for them.
+
+        -----------------------------------------------
+        InDepth:
+        --------
+
+        from deafadder_container.Instrumentation import MetricsCollector
+
+        metrics = MetricsCollector()
+        Component.set_instrumentation(metrics)
+        ...
+        metrics.snapshot()
+        -----------------------------------------------
+
+        :param instrumentation: the instrumentation receiving the metrics, None to stop collecting them
+        """
+        # the no-op base class is not even called
+        Component._instrumentation = None if type(instrumentation) is Instrumentation else instrumentation
+
+    @staticmethod
+    def set_trace(enabled: bool = True) -> None:
+        """Emit a structured trace of the container operations
+
+        Each operation is logged at DEBUG level on the 'deafadder_container.MetaTemplate.trace' logger. The record
+        message is a readable summary, and the 'trace' attribute of the record holds the fields of the event as a
+        dictionary (for a JSON formatter, for instance):
+
+        - get: component, instance_name, hit (False when the instance is created)
+        - create: component, instance_name, init_seconds, autowire_seconds, post_init_seconds
+        - inject: component, instance_name, field, dependency, dependency_names, lazy, live
+        - remove: component, instance_names (delete, delete_all, purge, eviction, garbage collection...)
+        - evict: component, expired, least_recently_used
+
+        The trace is off by default, so it costs nothing (unlike the regular DEBUG logs, it is not enabled by
+        the logging level alone).
+
+        :param enabled: True to emit the trace, False to stop
+        """
+        Component._tracing = enabled
+
+    @staticmethod
+    def freeze() -> None:
+        """Make the registry read-only, for predictable low latency lookups once the application is started
+
+        The instances are copied into a flat, read-only structure: Component.get, singleton lookups (MyComponent()),
+        Component.get_all and autowiring of prototypes read it without any lock. Any change of the registry
+        (creating a missing singleton, Component.of, delete, delete_all, purge, evict, shutdown) raises a
+        RegistryFrozen exception until Component.unfreeze is called.
+
+        The PROTOTYPE, THREAD, CONTEXT and POOLED scopes are not part of the registry: they still work. While frozen,
+        the eviction policies are suspended (no TTL, no LRU), and weakly referenced instances are kept alive.
+
+        -----------------------------------------------
+        InDepth:
+        --------
+
+        Component.bootstrap(my_app.services)
+        Component.freeze()
+        ...
+        Component.unfreeze()
+        Component.shutdown()
+        -----------------------------------------------
+        """
+        with _Anchor._lock:
+            _Anchor._remove_collected_entries()
+            classes = {actual_class: _instances_of(entries.values()) for actual_class, entries in _Anchor._instances.items() if entries}
+            instances = {(actual_class, name): instance for actual_class, named_instances in classes.items()
+                         for name, instance in named_instances.items()}
+            Component._frozen = _FrozenRegistry(instances=instances, classes=classes)
+        log.debug("(freeze) Registry frozen with %s instances", len(instances))
+
+    @staticmethod
+    def unfreeze() -> None:
+        """Make the registry modifiable again, see Component.freeze"""
+        with _Anchor._lock:
+            Component._frozen = None
+        log.debug("(unfreeze) Registry unfrozen")
+
+    @staticmethod
+    def is_frozen() -> bool:
+        """Tell if the registry is frozen, see Component.freeze"""
+        return Component._frozen is not None
+
+    @staticmethod
+    def _before_fork() -> None:
+        """Hold the registry lock while forking, so that the child inherits a registry that isn't being modified."""
+        _Anchor._lock.acquire()
+
+    @staticmethod
+    def _after_fork_in_parent() -> None:
+        _Anchor._lock.release()
+
+    @staticmethod
+    def _after_fork_in_child() -> None:
+        """Make the container usable in a child process created with os.fork, then apply the fork policies.
+
+        Only the forking thread exists in the child: the locks that the other threads of the parent may have been
+        holding are replaced, along with what depends on them (pending async creations, pools of POOLED instances).
+        """
+        Component._lock = Lock()
+        Component._creation_locks = weakref.WeakValueDictionary()
+        Component._async_creations = weakref.WeakKeyDictionary()
+        Component._pools = {}
+        frozen = Component._frozen is not None
+        Component._frozen = None
+        try:
+            Component._apply_fork_policies(_Anchor)
+        finally:
+            if frozen:
+                Component.freeze()
+
+    def _apply_fork_policies(cls) -> None:
+        """Anchor method calling the _post_fork of the shared instances, then recreating (or dropping) the others.
+
+        The errors are only logged: they can't be reported to the code calling os.fork.
+        """
+        with cls._lock:
+            cls._remove_collected_entries()
+            entries = sorted(((actual_class, entry) for actual_class, named_instances in cls._instances.items()
+                              for entry in named_instances.values()), key=lambda e: e[1].order)
+            replaced = [(actual_class, entry) for actual_class, entry in entries if actual_class in cls._fork_policies]
+            for actual_class, entry in replaced:
+                cls._unregister(actual_class, entry.name)
+
+        for actual_class, entry in entries:
+            instance = entry.instance
+            if actual_class not in cls._fork_policies and instance is not None:
+                try:
+                    _apply_post_fork(instance)
+                except Exception:
+                    log.exception("(fork) The _post_fork of %s, %s failed", actual_class, entry.name)
+        for actual_class, entry in replaced:
+            if cls._fork_policies[actual_class] is ForkPolicy.RECREATE:
+                log.debug("(fork) Recreating %s, %s in the child process", actual_class, entry.name)
+                try:
+                    actual_class(instance_name=entry.name, tags=list(entry.tags) or None)
+                except Exception:
+                    log.exception("(fork) Unable to recreate %s, %s in the child process", actual_class, entry.name)
+
+    @staticmethod
+    def _check_not_frozen(operation: str, *args) -> None:
+        """Raise a RegistryFrozen exception if the registry is frozen.
+
+        :param operation: the attempted change, as a %-style format only applied to the args when raising
+        """
+        if Component._frozen is not None:
+            raise RegistryFrozen(f"Unable to {operation % args}: the registry is frozen (see Component.unfreeze)")
+
+    @staticmethod
+    def _bump_registry_epoch(actual_class):
+        """Invalidate the wiring plans that depend on the presence of the class in the container."""
+        Component._registry_epoch += 1
+        Component._presence_versions[actual_class] = Component._presence_versions.get(actual_class, 0) + 1
+
+    def _new_entry(cls, actual_class, instance_name: str, instance, tags: List[str] = None,
+                   dependencies: List[Tuple[Any, str]] = None, weak: bool = False) -> _NamedInstance:
+        """Create the entry of a new instance, weakly referencing it when asked or when its class is weak."""
+        if weak or actual_class in cls._weak_classes:
+            return _WeakNamedInstance(actual_class, instance_name, instance, tags=tags, dependencies=dependencies)
+        return _NamedInstance(instance_name, instance, tags=tags, dependencies=dependencies)
+
+    def _register(cls, actual_class, named_instance: _NamedInstance) -> None:
+        """Add a new entry for the class, keeping the tag index in sync. Must be called with the lock acquired."""
+        Component._check_not_frozen("register an instance of %s with name '%s'", actual_class, named_instance.name)
+        if named_instance.name in cls._instances.get(actual_class, ()):
+            # only a garbage collected instance not removed yet can be replaced
+            cls._unregister(actual_class, named_instance.name)
+        entries = cls._instances.setdefault(actual_class, {})
+        if not entries:
+            Component._bump_registry_epoch(actual_class)
+        entries[named_instance.name] = named_instance
+        cls._class_versions[actual_class] = cls._class_versions.get(actual_class, 0) + 1
+        if named_instance.tags:
+            tag_index = cls._tag_index.setdefault(actual_class, {})
+            for tag in named_instance.tags:
+                tag_index.setdefault(tag, {})[named_instance.name] = None
+        cls._remove_collected_entries()
+
+    def _unregister(cls, actual_class, instance_name: str) -> _NamedInstance:
+        """Remove an existing entry for the class, keeping the tag index in sync. Must be called with the lock acquired."""
+        return cls._unregister_many(actual_class, [instance_name])[instance_name]
+
+    def _unregister_many(cls, actual_class, instance_names) -> Dict[str, _NamedInstance]:
+        """Remove existing entries for the class in a single pass. Must be called with the lock acquired.
+
+        Each removal is a constant time dict operation (plus one per tag of the removed instance), and removing every
+        entry of the class drops its structures at once.
+        """
+        Component._check_not_frozen("remove instances of %s", actual_class)
+        entries = cls._instances[actual_class]
+        cls._class_versions[actual_class] = cls._class_versions.get(actual_class, 0) + 1
+        if len(instance_names) == len(entries):
+            removed = cls._instances.pop(actual_class)
+            cls._tag_index.pop(actual_class, None)
+            cls._query_cache.pop(actual_class, None)
+        else:
+            removed = {name: entries.pop(name) for name in instance_names}
+            tag_index = cls._tag_index.get(actual_class)
+            if tag_index is not None:
+                for name, named_instance in removed.items():
+                    for tag in named_instance.tags:
+                        names = tag_index.get(tag)
+                        if names is not None:
+                            names.pop(name, None)
+                            if not names:
+                                tag_index.pop(tag)
+        if removed and (actual_class not in cls._instances or not entries):
+            Component._bump_registry_epoch(actual_class)
+        if cls._tracing:
+            _trace("remove", component=actual_class, instance_names=list(removed))
+        cls._remove_collected_entries()
+        return removed
+
+    def _remove_collected(cls, actual_class, named_instance: _NamedInstance) -> None:
+        """Finalizer of a weakly referenced instance, removing its entry from the registry.
+
+        It runs whenever the instance is garbage collected, possibly in a thread already holding the lock, so it never
+        waits for the lock: when the lock is not available, the removal is left to the next mutation of the registry.
+        """
+        cls._collected_entries.append((actual_class, named_instance))
+        if cls._lock.acquire(blocking=False):
+            try:
+                cls._remove_collected_entries()
+            finally:
+                cls._lock.release()
+
+    def _remove_collected_entries(cls) -> None:
+        """Remove the entries of the garbage collected instances. Must be called with the lock acquired."""
+        while cls._collected_entries:
+            actual_class, named_instance = cls._collected_entries.popleft()
+            entries = cls._instances.get(actual_class)
+            # the name may have been deleted, or reused by a new instance, meanwhile
+            if entries is not None and entries.get(named_instance.name) is named_instance:
+                log.debug("(weak) Removing the garbage collected instance %s, %s", actual_class, named_instance.name)
+                cls._unregister(actual_class, named_instance.name)
+
+    def _get_entry_for_name(cls, actual_class, instance_name) -> Optional[_NamedInstance]:
+        entries = cls._instances.get(actual_class)
+        entry = entries.get(instance_name) if entries is not None else None
+        if entry is not None and entry.weak and entry.instance is None:
+            return None
+        return entry
+
+    def _access_instance(cls, actual_class, instance_name):
+        """Lock free lookup of an instance being retrieved, enforcing the eviction policy of its class.
+
+        The last access of the instance is updated, and an instance idle for longer than the TTL of its class is
+        evicted instead of being returned.
+
+        While the registry is frozen, the instance is read from its flat copy, and the eviction policy is suspended.
+        """
+        frozen = cls._frozen
+        if frozen is not None:
+            return frozen.instances.get((actual_class, instance_name))
+        policy = cls._eviction_policies.get(actual_class)
+        if policy is None:
+            return cls._get_instance_for_name(actual_class, instance_name)
+        entry = cls._get_entry_for_name(actual_class, instance_name)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if policy.ttl is not None and now - entry.last_access > policy.ttl:
+            Component._evict(cls, actual_class)
+            return None
+        entry.last_access = now
+        return entry.instance
+
+    def _get_instance_for_name(cls, actual_class, instance_name):
+        """The instance with the given name, or None. Unlike the entry, the returned instance can't be garbage collected."""
+        entries = cls._instances.get(actual_class)
+        entry = entries.get(instance_name) if entries is not None else None
+        return entry.instance if entry is not None else None
+
+    def _names_for_tags(cls, actual_class, tags: List[str] = None) -> set:
+        """Names of the instances of the class having at least one of the given tags."""
+        if not tags:
+            return set()
+        tag_index = cls._tag_index.get(actual_class, {})
+        return set().union(*(tag_index.get(tag, ()) for tag in tags))
 
     @staticmethod
     def contains(cls) -> bool:
@@ -369,11 +1831,6 @@ class Component(type):
         return actual_class in cls._instances and cls._instances[actual_class]
 
 
-class _Anchor(metaclass=Component):
-    """This is a dummy class only to enable access to the metaclass inner field through it."""
-    pass
-
-
 class _AutowireType(Enum):
     INSTANCE = auto()
     LIST = auto()
@@ -395,33 +1852,24 @@ class _AutowireCandidate:
     """Used internally for autowiring mechanism.
     It groups together the attribute to autowire in the Component, the component instance name to use and the component class to use
     for injection.
-    """
 
-    attribute_name: str
-    component_instance_name: List[str]
-    component_class: Any
-    autowire_type: _AutowireType
+    The candidates are created once per class, with its _WiringPlan, and never modified afterwards.
+    """
+    __slots__ = ("attribute_name", "component_instance_name", "component_class", "autowire_type", "lazy", "live")
 
     def __init__(self,
                  attribute_name: str = None,
                  component_instance_name: List[str] = None,
                  component_class: Any = None,
-                 autowire_type: _AutowireType = None):
+                 autowire_type: _AutowireType = None,
+                 lazy: bool = False,
+                 live: bool = False):
         self.attribute_name = attribute_name
         self.component_instance_name = component_instance_name or []
         self.component_class = component_class
         self.autowire_type = autowire_type
-
-    def set(self,
-            attribute_name: str = None,
-            component_instance_name: List[str] = None,
-            component_class: Any = None,
-            autowire_type: _AutowireType = None):
-        self.attribute_name = attribute_name or self.attribute_name
-        self.component_instance_name = component_instance_name or self.component_instance_name
-        self.component_class = component_class or self.component_class
-        self.autowire_type = autowire_type or self.autowire_type
-        return self
+        self.lazy = lazy
+        self.live = live
 
     def is_default(self):
         return len(self.component_instance_name) == 0
@@ -432,6 +1880,58 @@ class _AutowireCandidate:
     def is_dict_collection(self):
         return self.autowire_type is not None and self.autowire_type is _AutowireType.DICT
 
+    def key(self) -> tuple:
+        return self.attribute_name, tuple(self.component_instance_name), self.component_class, self.autowire_type, self.lazy, self.live
+
+
+class _WiringPlan:
+    """Used internally to cache the result of the autowiring analysis of a Component class.
+
+    Finding which fields have to be injected requires to read the autowire decorators of the class and to inspect
+    all its annotations. The result only depends on the class itself and, for classes that are turned
+    into Component with Component.of, on the content of the container. So it is computed once, when the class is
+    defined, and reused by every instantiation as long as the classes it checked with Component.contains don't gain
+    their first instance or lose their last one.
+    """
+
+    def __init__(self,
+                 default_candidates: List[_AutowireCandidate],
+                 non_default_candidates: List[_AutowireCandidate],
+                 explicit_args: List[str],
+                 duplicate_args: List[str],
+                 unknown_explicit_args: List[str],
+                 registry_dependencies: Dict[Any, int] = None,
+                 epoch: int = None,
+                 unresolved_forward_references: List[str] = None):
+        self.default_candidates = tuple(default_candidates)
+        self.non_default_candidates = tuple(non_default_candidates)
+        self.explicit_args = tuple(explicit_args)
+        self.duplicate_args = tuple(duplicate_args)
+        self.unknown_explicit_args = frozenset(unknown_explicit_args)
+        # class checked with Component.contains -> its presence version at that time
+        self.registry_dependencies = tuple((registry_dependencies or {}).items())
+        # only set with unresolved forward references, tried again on any change of the classes present in the
+        # registry. None means the plan never has to be recomputed because of the registry epoch
+        self.epoch = epoch
+        # fields whose annotation references a name that isn't defined yet, not injected
+        self.unresolved_forward_references = tuple(unresolved_forward_references or ())
+        # injection function generated from this plan on first use, see _AutowireMechanism.compile
+        self.injector: Optional[Callable[[Any], List[Tuple[Any, str]]]] = None
+
+    def is_valid(self) -> bool:
+        if self.epoch is not None and self.epoch != Component._registry_epoch:
+            return False
+        presence_versions = Component._presence_versions
+        return all(presence_versions.get(clazz, 0) == version for clazz, version in self.registry_dependencies)
+
+    def has_same_wiring(self, other: "_WiringPlan") -> bool:
+        """Tell if the injection function generated from the other plan also applies to this one."""
+        return ([c.key() for c in self.default_candidates] == [c.key() for c in other.default_candidates]
+                and [c.key() for c in self.non_default_candidates] == [c.key() for c in other.non_default_candidates]
+                and self.explicit_args == other.explicit_args
+                and self.duplicate_args == other.duplicate_args
+                and self.unknown_explicit_args == other.unknown_explicit_args)
+
 
 class _AutowireMechanism:
     """Package the autowiring mechanism
@@ -440,81 +1940,390 @@ class _AutowireMechanism:
     either explicitly (with the autowire decorator) or implicitly (when the component with the default name is
     required).
 
-    It uses ast to parse the Abstract Syntax Tree and inspect to get the source of the Component.
+    The explicit mapping is recorded on the __init__ method by the autowire decorator and read once, when the
+    Component class is created.
+
+    The analysis of a Component class is done once and cached as a _WiringPlan, so that each component, at creation
+    time, only has to check which fields are not already set and retrieve the correct instance to inject into the
+    correct fields.
 
-    Each component, at creation time, will be inspected by this class to detect if autowiring is needed and, if so,
-    retrieve the correct instance to inject into the correct fields.
+    The plan is then compiled into an injection function specialized for the class (see compile), so that creating
+    a component doesn't interpret the plan field by field. The interpreted path (apply) is only used when the
+    injections are logged or traced.
     """
-    autowire_triplet_candidates: List[_AutowireCandidate] = []
-    _autowire_candidates: List[_AutowireCandidate] = []
-    _autowire_non_default_candidates: List[_AutowireCandidate] = []
-    _autowire_default_candidates: List[_AutowireCandidate] = []
-    _instance = None
-    _cls = None
-    _instance_name = None
+    __slots__ = ("autowire_triplet_candidates", "_instance", "_cls", "_instance_name")
 
-    def __init__(self, instance, cls, instance_name):
-        try:
-            instance.__annotations__
-        except AttributeError:
-            return
+    _plans: Dict[Any, _WiringPlan] = {}
+    _init_decorators_cache: Dict[Any, Dict[str, List[list]]] = {}
 
+    def __init__(self, instance, cls, instance_name):
         self._instance = instance
         self._cls = cls
         self._instance_name = instance_name
+        self.autowire_triplet_candidates: Tuple[_AutowireCandidate, ...] = ()
 
-        self._infer_autowire_candidates()
-        self._infer_explicit_autowire_candidates()
-        self._infer_autowire_default_candidates()
-        self.autowire_triplet_candidates = [*self._autowire_default_candidates, *self._autowire_non_default_candidates]
+        plan = self.plan_for(instance.__class__)
+        if plan is None:
+            return
 
-    def apply(self):
+        self._check_explicit_autowire_candidates(plan)
+        self.autowire_triplet_candidates = (
+            *[c for c in plan.default_candidates if not hasattr(instance, c.attribute_name)],
+            *plan.non_default_candidates
+        )
+
+    def apply(self) -> List[Tuple[Any, str]]:
         """Apply auto wire mechanism on the given instance.
 
         After init of this class, if any filed need to be injected using the auto wire mechanism,
         this method inject the correct instance into all those field that requires automatic injection
         of Component.
 
-        :return: None
+        :return: the (class, name) of the injected instances
         """
-        if self.autowire_triplet_candidates:
-            log.debug(f"(_AutowireMechanism.apply {self._cls}, {self._instance_name}) Injecting dependencies:")
-        else:
-            log.debug(f"(_AutowireMechanism.apply {self._cls}, {self._instance_name}) Nothing to inject")
+        dependencies = []
+        # checked once for all the fields, nothing is logged (nor formatted) on the hot path when DEBUG is disabled
+        debug = log.isEnabledFor(logging.DEBUG)
+        tracing = Component._tracing
+        if debug:
+            if self.autowire_triplet_candidates:
+                log.debug("(_AutowireMechanism.apply %s, %s) Injecting dependencies:", self._cls, self._instance_name)
+            else:
+                log.debug("(_AutowireMechanism.apply %s, %s) Nothing to inject", self._cls, self._instance_name)
         for autowire_candidate in self.autowire_triplet_candidates:
-            log.debug(f"(_AutowireMechanism.apply {self._cls}, {self._instance_name})      Injecting the dependency "
-                      f"{autowire_candidate.component_class} with name '{autowire_candidate.component_instance_name}' "
-                      f"in the field '{autowire_candidate.attribute_name}'")
-            self._autowire(autowire_candidate)
+            if debug:
+                log.debug("(_AutowireMechanism.apply %s, %s)      Injecting the dependency %s with name '%s' in the field '%s'",
+                          self._cls, self._instance_name, autowire_candidate.component_class,
+                          autowire_candidate.component_instance_name, autowire_candidate.attribute_name)
+            injected = self._inject_candidate(self._instance, autowire_candidate)
+            if tracing:
+                _trace("inject", component=self._cls, instance_name=self._instance_name,
+                       field=autowire_candidate.attribute_name, dependency=autowire_candidate.component_class,
+                       dependency_names=[name for _, name in injected], lazy=autowire_candidate.lazy,
+                       live=autowire_candidate.live)
+            dependencies.extend(injected)
+
+        if debug and self.autowire_triplet_candidates:
+            log.debug("(_AutowireMechanism.apply %s, %s) Dependency injection finished", self._cls, self._instance_name)
+        return dependencies
 
-        if self.autowire_triplet_candidates:
-            log.debug(f"(_AutowireMechanism.apply {self._cls}, {self._instance_name}) Dependency injection finished")
+    @staticmethod
+    def _inject_candidate(instance, candidate: _AutowireCandidate) -> List[Tuple[Any, str]]:
+        """Inject the field of the candidate in the instance
 
-    def _autowire(self, candidate: _AutowireCandidate):
-        if candidate.is_collection():
+        :return: the (class, name) of the injected instances
+        """
+        if candidate.live:
+            element_to_inject = _LiveComponentView.of(candidate.component_class,
+                                                      None if candidate.is_default() else candidate.component_instance_name,
+                                                      as_dict=candidate.is_dict_collection())
+            # the content of the view changes over time, it can't be a dependency
+            injected_names = []
+        elif candidate.is_collection():
             instance_names_to_inject = candidate.component_instance_name
             if candidate.is_default():
-                element_dict_to_inject = Component.get_all(candidate.component_class, dirty_context=True)
+                element_dict_to_inject = Component.get_all(candidate.component_class)
             else:
-                element_dict_to_inject = Component.get_all(candidate.component_class, names=instance_names_to_inject, dirty_context=True)
+                element_dict_to_inject = Component.get_all(candidate.component_class, names=instance_names_to_inject)
 
             element_to_inject = element_dict_to_inject if candidate.is_dict_collection() else [v for _, v in element_dict_to_inject.items()]
+            injected_names = list(element_dict_to_inject)
 
         else:
             # this is a single instance to inject directly, not inside a collection
             instance_name_to_inject = DEFAULT_INSTANCE_NAME if candidate.is_default() else candidate.component_instance_name[0]
-            element_to_inject = Component.get(candidate.component_class, instance_name_to_inject)
+            if candidate.lazy:
+                element_to_inject = _LazyComponentProxy(candidate.component_class, instance_name_to_inject)
+                # a lazy reference is how a circular dependency is declared, like for the bootstrap it is not an edge
+                injected_names = []
+            else:
+                element_to_inject = Component.get(candidate.component_class, instance_name_to_inject)
+                injected_names = [instance_name_to_inject]
 
-        setattr(self._instance, candidate.attribute_name, element_to_inject)
+        setattr(instance, candidate.attribute_name, element_to_inject)
+        return [(candidate.component_class, name) for name in injected_names]
 
-    def _infer_autowire_candidates(self):
-        annotations = self._instance.__annotations__
-        self._autowire_candidates = [_AutowireCandidate(attribute_name=k,
-                                                        component_class=self._base_component_class(v),
-                                                        autowire_type=self._get_injection_type(v))
-                                     for k, v in annotations.items()
-                                     if not hasattr(self._instance, k)
-                                     and (self._is_component(v) or self._is_collection_of_component(v))]
+    def _check_explicit_autowire_candidates(self, plan: _WiringPlan) -> None:
+        _AutowireMechanism._check_explicit_args(self._instance, plan)
+
+    @staticmethod
+    def _check_explicit_args(instance, plan: _WiringPlan) -> None:
+        """Validate the explicit autowire mapping of the plan against the instance being created.
+
+        Fields set during __init__ can't be autowired, so this part of the check can't be cached with the plan.
+        """
+        if not plan.explicit_args:
+            return
+        if plan.duplicate_args:
+            raise MultipleAutowireReference(f"The following arguments are referenced multiple times in autowire: {', '.join(plan.duplicate_args)}")
+
+        not_annotated_elements_in_explicit_autowire = [i for i in plan.explicit_args
+                                                       if i in plan.unknown_explicit_args or hasattr(instance, i)]
+        if len(not_annotated_elements_in_explicit_autowire) > 0:
+            raise AnnotatedDeclarationMissing(f"Elements to autowire '{', '.join(not_annotated_elements_in_explicit_autowire)}'"
+                                              f" should be defined and annotated at class level.")
+
+    @staticmethod
+    def inject(instance, cls, instance_name: str) -> List[Tuple[Any, str]]:
+        """Autowire the fields of a new instance with the injection function compiled for its class.
+
+        :param instance: the instance being created
+        :param cls: the Component class of the instance
+        :param instance_name: the name of the instance being created
+        :return: the (class, name) of the injected instances
+        """
+        plan = _AutowireMechanism.plan_for(instance.__class__)
+        if plan is None:
+            return []
+        if Component._tracing or log.isEnabledFor(logging.DEBUG):
+            # the compiled function doesn't log each injection
+            return _AutowireMechanism(instance, cls, instance_name).apply()
+        injector = plan.injector
+        if injector is None:
+            injector = plan.injector = _AutowireMechanism.compile(plan)
+        return injector(instance)
+
+    @staticmethod
+    def compile(plan: _WiringPlan) -> Callable[[Any], List[Tuple[Any, str]]]:
+        """Generate the injection function of a wiring plan.
+
+        The function does what apply does, without going through the candidates of the plan: the checks and
+        branches only depending on the plan are resolved once, here. Single instances are retrieved and set
+        inline, with the anchor of their class already known, the other kinds of fields (collections, Lazy, Live)
+        are delegated to _inject_candidate.
+
+        For instance, with a field "repository: Repository" and a field "handlers: List[Handler]":
+
+        def inject(instance):
+            dependencies = []
+            if not hasattr(instance, 'repository'):
+                instance.repository = get(anchor_0, class_0, name_0)
+                dependencies.append(dependency_0)
+            if not hasattr(instance, 'handlers'):
+                dependencies.extend(inject_candidate(instance, candidate_1))
+            return dependencies
+
+        :param plan: the wiring plan of a class
+        :return: a function injecting the fields of an instance of the class and returning the (class, name)
+                 of the injected instances
+        """
+        namespace = {"get": Component._get, "inject_candidate": _AutowireMechanism._inject_candidate,
+                     "check_explicit_args": _AutowireMechanism._check_explicit_args, "plan": plan}
+        lines = ["def inject(instance):"]
+        if plan.explicit_args:
+            lines.append("    check_explicit_args(instance, plan)")
+        lines.append("    dependencies = []")
+        candidates = [(True, c) for c in plan.default_candidates] + [(False, c) for c in plan.non_default_candidates]
+        for i, (default, candidate) in enumerate(candidates):
+            indent = "    "
+            if default:
+                lines.append(f"    if not hasattr(instance, {candidate.attribute_name!r}):")
+                indent = "        "
+            if candidate.live or candidate.lazy or candidate.is_collection():
+                namespace[f"candidate_{i}"] = candidate
+                lines.append(f"{indent}dependencies.extend(inject_candidate(instance, candidate_{i}))")
+                continue
+            component_class = candidate.component_class
+            instance_name = DEFAULT_INSTANCE_NAME if candidate.is_default() else candidate.component_instance_name[0]
+            namespace[f"anchor_{i}"] = component_class if type(component_class) is Component else _Anchor
+            namespace[f"class_{i}"] = component_class
+            namespace[f"name_{i}"] = instance_name
+            namespace[f"dependency_{i}"] = (component_class, instance_name)
+            value = f"get(anchor_{i}, class_{i}, name_{i})"
+            if candidate.attribute_name.isidentifier() and not keyword.iskeyword(candidate.attribute_name):
+                lines.append(f"{indent}instance.{candidate.attribute_name} = {value}")
+            else:
+                lines.append(f"{indent}setattr(instance, {candidate.attribute_name!r}, {value})")
+            lines.append(f"{indent}dependencies.append(dependency_{i})")
+        lines.append("    return dependencies")
+
+        exec(compile("\n".join(lines), "<deafadder_container injector>", "exec"), namespace)
+        return namespace["inject"]
+
+    @staticmethod
+    def plan_for(cls) -> Optional[_WiringPlan]:
+        """Retrieve the wiring plan of the given class, computing it if it is missing or outdated.
+
+        :param cls: the class of the instance to autowire
+        :return: the wiring plan, or None if the class doesn't have any annotation
+        """
+        plan = _AutowireMechanism._plans.get(cls)
+        if plan is None or not plan.is_valid():
+            outdated_plan, plan = plan, _AutowireMechanism._compute_plan(cls)
+            if plan is None:
+                return None
+            if plan.unresolved_forward_references:
+                log.warning("(autowire %s) The annotations of the fields %s reference names that can't be resolved, "
+                            "they are not injected", cls, ", ".join(plan.unresolved_forward_references))
+            if outdated_plan is not None and plan.has_same_wiring(outdated_plan):
+                # the registry changed back and forth meanwhile: the injection function doesn't have to be compiled again
+                plan.injector = outdated_plan.injector
+            _AutowireMechanism._plans[cls] = plan
+        return plan
+
+    @staticmethod
+    def analyse(cls) -> None:
+        """Compute the wiring plan of a class when it is defined.
+
+        A plan with forward references that can't be resolved yet (the referenced class is defined later in the
+        module) is not kept: it will be computed on the first instantiation, when it most likely can be resolved.
+        """
+        plan = _AutowireMechanism._compute_plan(cls)
+        if plan is not None and not plan.unresolved_forward_references:
+            _AutowireMechanism._plans[cls] = plan
+
+    @staticmethod
+    def invalidate_plans() -> None:
+        """Drop every cached wiring plan so they are computed again on next use."""
+        _AutowireMechanism._plans.clear()
+
+    @staticmethod
+    def record_init_decorators(cls) -> None:
+        """Store the autowire decorators of the __init__ of the class, called when a Component class is created."""
+        _AutowireMechanism._init_decorators_cache[cls] = _AutowireMechanism._get_init_decorators(cls)
+
+    @staticmethod
+    def _compute_plan(cls) -> Optional[_WiringPlan]:
+        annotations = _AutowireMechanism._class_annotations(cls)
+        if annotations is None:
+            return None
+
+        # the versions are read before the analysis so that a registry change during the analysis invalidates the plan
+        epoch = Component._registry_epoch
+        registry_dependencies = {}
+        autowire_candidates = {}
+        unresolved_forward_references = []
+        for k, v in annotations.items():
+            if _AutowireMechanism._is_class_attribute(cls, k):
+                continue
+            v, resolved = _AutowireMechanism._resolve_forward_references(cls, k, v)
+            if not resolved:
+                unresolved_forward_references.append(k)
+                continue
+            registry_dependency = _AutowireMechanism._registry_dependency(v)
+            if registry_dependency is not None:
+                registry_dependencies[registry_dependency] = Component._presence_versions.get(registry_dependency, 0)
+            lazy = _AutowireMechanism._is_lazy(v)
+            live = _AutowireMechanism._is_live(v)
+            annotation = v.__args__[0] if lazy or live else v
+            _AutowireMechanism._check_lazy_and_live(cls, k, annotation, lazy, live)
+            if _AutowireMechanism._is_component(annotation) or _AutowireMechanism._is_collection_of_component(annotation):
+                autowire_candidates[k] = _AutowireCandidate(attribute_name=k,
+                                                            component_class=_AutowireMechanism._base_component_class(annotation),
+                                                            autowire_type=_AutowireMechanism._get_injection_type(annotation),
+                                                            lazy=lazy,
+                                                            live=live)
+
+        init_decorators = _AutowireMechanism._init_decorators_cache.get(cls)
+        if init_decorators is None:
+            init_decorators = _AutowireMechanism._get_init_decorators(cls)
+            _AutowireMechanism._init_decorators_cache[cls] = init_decorators
+
+        flattened_args = [t for sublist in init_decorators.get("autowire", []) for t in sublist]
+        all_args_name = [i[0] for i in flattened_args]
+        duplicate_args = [name for name, times in _AutowireMechanism._count_name_occurrence(all_args_name).items() if times > 1]
+        unknown_args = [i for i in all_args_name if i not in autowire_candidates]
+
+        non_default_candidates = []
+        if not duplicate_args and not unknown_args:
+            non_default_candidates = [
+                _AutowireCandidate(attribute_name=name,
+                                   component_instance_name=instance_names,
+                                   component_class=autowire_candidates[name].component_class,
+                                   autowire_type=autowire_candidates[name].autowire_type,
+                                   lazy=autowire_candidates[name].lazy,
+                                   live=autowire_candidates[name].live)
+                for name, instance_names in flattened_args
+            ]
+        default_candidates = [c for k, c in autowire_candidates.items() if k not in all_args_name]
+
+        return _WiringPlan(default_candidates=default_candidates,
+                           non_default_candidates=non_default_candidates,
+                           explicit_args=all_args_name,
+                           duplicate_args=duplicate_args,
+                           unknown_explicit_args=unknown_args,
+                           registry_dependencies=registry_dependencies,
+                           # an unresolved forward reference is tried again once the content of the registry changes
+                           epoch=epoch if unresolved_forward_references else None,
+                           unresolved_forward_references=unresolved_forward_references)
+
+    @staticmethod
+    def _check_lazy_and_live(cls, name: str, annotation, lazy: bool, live: bool) -> None:
+        """Only single instances can be lazy, and only collections can be live."""
+        if live and _AutowireMechanism._is_component(annotation):
+            raise InvalidAnnotation(f"Field '{name}' of {cls}: Live[...] only applies to List[...] and Dict[str, ...], "
+                                    f"use Lazy[{getattr(annotation, '__name__', annotation)}] for a single Component")
+        if lazy and _AutowireMechanism._is_collection_of_component(annotation):
+            raise InvalidAnnotation(f"Field '{name}' of {cls}: Lazy[...] only applies to a single Component, "
+                                    f"use Live[...] for a collection")
+
+    @staticmethod
+    def _resolve_forward_references(cls, name: str, annotation) -> Tuple[Any, bool]:
+        """Evaluate the string annotations (also inside List, Dict or Lazy) in the namespace of the class module.
+
+        :return: the evaluated annotation and True, or the annotation as is and False if it can't be evaluated yet
+        :raises: InvalidAnnotation if the annotation can never be evaluated (invalid expression, ...)
+        """
+        if not isinstance(annotation, str) and not _AutowireMechanism._has_forward_reference(annotation):
+            return annotation, True
+
+        module = sys.modules.get(cls.__module__)
+        global_namespace = vars(module) if module is not None else {}
+        local_namespace = {cls.__name__: cls, **vars(cls)}
+        try:
+            return _AutowireMechanism._evaluate(annotation, global_namespace, local_namespace), True
+        except NameError:
+            # the referenced class is most likely defined later in the module
+            return annotation, False
+        except Exception as error:
+            raise InvalidAnnotation(f"Unable to evaluate the annotation {annotation!r} of the field '{name}' of {cls}: {error!r}") from error
+
+    @staticmethod
+    def _evaluate(annotation, global_namespace: dict, local_namespace: dict):
+        """Replace the forward references of the annotation by the class they name, evaluated in the namespaces."""
+        if isinstance(annotation, str):
+            return _AutowireMechanism._evaluate(eval(annotation, global_namespace, local_namespace), global_namespace, local_namespace)
+        if isinstance(annotation, typing.ForwardRef):
+            return _AutowireMechanism._evaluate(annotation.__forward_arg__, global_namespace, local_namespace)
+        if type(annotation) is typing._GenericAlias and _AutowireMechanism._has_forward_reference(annotation):
+            return annotation.copy_with(tuple(_AutowireMechanism._evaluate(a, global_namespace, local_namespace) for a in annotation.__args__))
+        return annotation
+
+    @staticmethod
+    def _has_forward_reference(annotation) -> bool:
+        if isinstance(annotation, typing.ForwardRef):
+            return True
+        return type(annotation) is typing._GenericAlias and any(_AutowireMechanism._has_forward_reference(a) for a in annotation.__args__)
+
+    @staticmethod
+    def _class_annotations(cls) -> Optional[dict]:
+        """Same lookup as instance.__annotations__: the annotations of the closest class in the mro defining some."""
+        for klass in cls.__mro__:
+            if "__annotations__" in klass.__dict__:
+                return klass.__dict__["__annotations__"]
+        return None
+
+    @staticmethod
+    def _is_class_attribute(cls, name: str) -> bool:
+        """Same as hasattr on an instance, without the instance attributes, nor the metaclass ones."""
+        return any(name in klass.__dict__ for klass in cls.__mro__)
+
+    @staticmethod
+    def _registry_dependency(clazz):
+        """The class checked with Component.contains to decide whether the annotation is a Component, if any"""
+        if _AutowireMechanism._is_lazy(clazz) or _AutowireMechanism._is_live(clazz):
+            clazz = clazz.__args__[0]
+        if type(clazz) is typing._GenericAlias and clazz.__origin__ in (list, dict):
+            clazz = clazz.__args__[0] if clazz.__origin__ is list else clazz.__args__[1]
+        return clazz if type(clazz) is not Component else None
+
+    @staticmethod
+    def _is_lazy(clazz) -> bool:
+        return type(clazz) is typing._GenericAlias and clazz.__origin__ is Lazy
+
+    @staticmethod
+    def _is_live(clazz) -> bool:
+        return type(clazz) is typing._GenericAlias and clazz.__origin__ is Live
 
     @staticmethod
     def _is_component(clazz) -> bool:
@@ -552,85 +2361,16 @@ class _AutowireMechanism:
             return _AutowireType.from_generic(clazz)
 
     @staticmethod
-    def _get_init_decorators(cls):
-        """Parse the AST to retrieve all decorator on the __init__ method for a given class"""
-        target = cls
-        init_decorators = {}
-
-        def get_string_value(decorator_arg: _ast.keyword) -> List[str]:
-            elements = []
-
-            # if the keyword is a simple element, like a string, then we the keyword.value has a value attribute
-            # that contains the string
-            # else, it is a list keyword and it contains an elts attribute where each element has a value attribute
-            if hasattr(decorator_arg.value, "value"):
-                elements.append(decorator_arg.value.value)
-            elif hasattr(decorator_arg.value, "elts"):
-                for e in decorator_arg.value.elts:
-                    elements.append(e.value)
-            return elements
-
-        def visit_function_def(node):
-            if node.name != "__init__":
-                return
-            for n in node.decorator_list:
-                decorator_args = []
-                name = ''
-                if isinstance(n, ast.Call):
-                    name = n.func.attr if isinstance(n.func, ast.Attribute) else n.func.id
-                    if name != "autowire":
-                        # might have an issue if the decorator is not exactly @autowire (like
-                        # with renaming on import or full import @deafadder_container.Wiring.autowire
-                        # or @Wiring.autowire. Will see later if there is an issue or a better way to do so
-                        # Could also cause an issue if we have another decorator from another package called
-                        # autowire.
-                        continue
-                    decorator_args = [(decorator_arg.arg, get_string_value(decorator_arg)) for decorator_arg in n.keywords]
-                # to be complete, the decorator without parenthesis should be included. But since we
-                # don't really need it, we can ignore it for now
-                #
-                # Sample code to be complete
-                # > else:
-                # >    name = n.attr if isinstance(n, ast.Attribute) else n.id
-
-                if name not in init_decorators:
-                    init_decorators[name] = []
-                init_decorators[name].append(decorator_args)
-
-        node_iter = ast.NodeVisitor()
-        node_iter.visit_FunctionDef = visit_function_def
-        node_iter.visit(ast.parse(inspect.getsource(target)))
-        return init_decorators
-
-    def _infer_explicit_autowire_candidates(self):
-        init_decorators = self._get_init_decorators(self._instance.__class__)
-        if not init_decorators:
-            self._autowire_non_default_candidates = []
-            return
-        autowire_decorators = init_decorators["autowire"]
-        flattened_args = [t for sublist in autowire_decorators for t in sublist]
-
-        all_args_name = [i[0] for i in flattened_args]
-
-        duplicate_args = [name for name, times in self._count_name_occurrence(all_args_name).items() if times > 1]
-        if len(duplicate_args) > 0:
-            raise MultipleAutowireReference(f"The following arguments are referenced multiple times in autowire: {', '.join(duplicate_args)}")
+    def _get_init_decorators(cls) -> Dict[str, List[list]]:
+        """Retrieve the arguments of the autowire decorators placed on the __init__ method of the given class.
 
-        annotated_elements = [i.attribute_name for i in self._autowire_candidates]
-        not_annotated_elements_in_explicit_autowire = [i for i in all_args_name if i not in annotated_elements]
-        if len(not_annotated_elements_in_explicit_autowire) > 0:
-            raise AnnotatedDeclarationMissing(f"Elements to autowire '{', '.join(not_annotated_elements_in_explicit_autowire)}'"
-                                              f" should be defined and annotated at class level.")
-
-        autowire_non_default_candidates_dict = {
-            candidate.attribute_name: candidate
-            for candidate in self._autowire_candidates
-            if candidate.attribute_name in all_args_name
-        }
-        self._autowire_non_default_candidates = [
-            autowire_non_default_candidates_dict[t[0]].set(component_instance_name=t[1])
-            for t in flattened_args
-        ]
+        They are recorded on the decorated function by the decorator itself, so any import style works (aliased
+        import, Wiring.autowire, ...) and the source of the class doesn't need to be available. Only the __init__
+        defined by the class itself is considered, not an inherited one.
+        """
+        init = cls.__dict__.get("__init__")
+        autowire_args = getattr(init, AUTOWIRE_ATTRIBUTE, None)
+        return {"autowire": autowire_args} if autowire_args else {}
 
     @staticmethod
     def _count_name_occurrence(names: list) -> dict:
@@ -640,23 +2380,261 @@ class _AutowireMechanism:
             occurrences[name] = occurrences[name] + 1
         return occurrences
 
-    def _infer_autowire_default_candidates(self) -> None:
-        """Retrieve all field in the component that should be autowired using the default instance if present.
 
-        It does not return any value but store the result inside the _autowire_default_candidates attribute
-        """
-        non_default_attribute_name = [i.attribute_name for i in self._autowire_non_default_candidates]
-        all_candidates_attribute_name = [i.attribute_name for i in self._autowire_candidates]
-        default_candidates = set(all_candidates_attribute_name) - set(non_default_attribute_name)
+class _LazyComponentProxy:
+    """Injected in the fields annotated with Lazy[...] instead of the actual Component.
+
+    The Component is only retrieved (with Component.get) on the first access to one of its attributes, and then
+    cached in the proxy. Until then, the Component doesn't even need to exist.
+    """
+
+    __slots__ = ("_component_class", "_instance_name", "_instance")
+
+    def __init__(self, component_class, instance_name: str):
+        object.__setattr__(self, "_component_class", component_class)
+        object.__setattr__(self, "_instance_name", instance_name)
+        object.__setattr__(self, "_instance", None)
+
+    def _resolve(self):
+        if self._instance is None:
+            # slots are only written with object.__setattr__ since __setattr__ is forwarded to the Component
+            object.__setattr__(self, "_instance", Component.get(self._component_class, self._instance_name))
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._resolve(), name)
+
+    def __repr__(self):
+        if self._instance is None:
+            return f"<lazy proxy for {self._component_class} '{self._instance_name}' (unresolved)>"
+        return repr(self._instance)
+
+
+class _LiveComponentView:
+    """Read only view over the registered instances of a class, injected in the fields annotated with Live[...].
+
+    The view doesn't copy anything when injected and always reflects the current content of the registry: the
+    instances registered (or deleted) after the injection are visible. The content is cached in the view, along with
+    the version of the class in the registry, and only computed again after a mutation of the instances of this class.
+
+    A single view is created and shared for each (class, names, kind) combination.
+    """
+
+    _views: Dict[Tuple[Any, Optional[Tuple[str, ...]], bool], "_LiveComponentView"] = {}
+
+    def __init__(self, component_class, names: Optional[Tuple[str, ...]] = None):
+        self._component_class = component_class
+        self._names = names
+        self._version = -1
+        self._items: Tuple[Tuple[str, Any], ...] = ()
+
+    @staticmethod
+    def of(component_class, names: Optional[List[str]] = None, as_dict: bool = False) -> "_LiveComponentView":
+        key = (component_class, tuple(names) if names is not None else None, as_dict)
+        view = _LiveComponentView._views.get(key)
+        if view is None:
+            view_class = _LiveComponentDictView if as_dict else _LiveComponentListView
+            view = _LiveComponentView._views.setdefault(key, view_class(component_class, key[1]))
+        return view
+
+    def _snapshot(self) -> Tuple[Tuple[str, Any], ...]:
+        # the version is read first: a mutation happening during the copy only triggers one more refresh
+        version = Component._class_versions.get(self._component_class, 0)
+        if version != self._version:
+            entries = list((Component._instances.get(self._component_class) or {}).values())
+            if self._names is not None:
+                entries = [e for e in entries if e.name in self._names]
+            items = tuple(_instances_of(entries).items())
+            if any(e.weak for e in entries):
+                # caching the instances would keep the weakly referenced ones alive
+                self._items, self._version = (), -1
+                return items
+            self._items = items
+            self._version = version
+        return self._items
+
+    def __len__(self):
+        return len(self._snapshot())
+
+    def __repr__(self):
+        return f"<live view of {self._component_class}: {[name for name, _ in self._snapshot()]}>"
+
+
+class _LiveComponentListView(_LiveComponentView, collections.abc.Sequence):
+    """Live view injected for Live[List[...]] fields"""
+
+    def __getitem__(self, index):
+        items = self._snapshot()
+        if isinstance(index, slice):
+            return [instance for _, instance in items[index]]
+        return items[index][1]
+
+    def __iter__(self):
+        return (instance for _, instance in self._snapshot())
+
+    def __eq__(self, other):
+        return list(self) == other if isinstance(other, (list, _LiveComponentListView)) else NotImplemented
+
+    __hash__ = None
+
+
+class _LiveComponentDictView(_LiveComponentView, collections.abc.Mapping):
+    """Live view injected for Live[Dict[str, ...]] fields"""
+
+    def __init__(self, component_class, names: Optional[Tuple[str, ...]] = None):
+        super().__init__(component_class, names)
+        self._by_name: Dict[str, Any] = {}
+        self._by_name_items: Tuple[Tuple[str, Any], ...] = ()
+
+    def _mapping(self) -> Dict[str, Any]:
+        items = self._snapshot()
+        if items is not self._items:
+            return dict(items)
+        if items is not self._by_name_items:
+            self._by_name = dict(items)
+            self._by_name_items = items
+        return self._by_name
+
+    def __getitem__(self, name):
+        return self._mapping()[name]
+
+    def __iter__(self):
+        return (name for name, _ in self._snapshot())
+
+    def __contains__(self, name):
+        return name in self._mapping()
+
+
+class _LockAcquisition:
+    """Hold a lock used for the given Component class, reporting the contention on it when instrumented."""
+    __slots__ = ("_lock", "_component_class")
+
+    def __init__(self, lock, component_class):
+        self._lock = lock
+        self._component_class = component_class
+
+    def __enter__(self):
+        instrumentation = Component._instrumentation
+        if instrumentation is None:
+            self._lock.acquire()
+        elif not self._lock.acquire(blocking=False):
+            start = time.perf_counter()
+            self._lock.acquire()
+            instrumentation.increment(LOCK_CONTENTIONS, self._component_class)
+            instrumentation.observe(LOCK_WAIT_SECONDS, self._component_class, time.perf_counter() - start)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._lock.release()
+
+
+class _TraceMessage:
+    """Message of a trace record, only formatted when the record is actually emitted."""
+    __slots__ = ("fields",)
 
-        self._autowire_default_candidates = [
-            candidate
-            for candidate in self._autowire_candidates
-            if candidate.attribute_name in default_candidates
-        ]
+    def __init__(self, fields: Dict[str, Any]):
+        self.fields = fields
+
+    def __str__(self):
+        return " ".join(f"{key}={value!r}" if key != "event" else value for key, value in self.fields.items())
+
+
+def _trace(event: str, **fields) -> None:
+    fields = {"event": event, **fields}
+    trace_log.debug("%s", _TraceMessage(fields), extra={"trace": fields})
+
+
+def _instances_of(entries) -> Dict[str, Any]:
+    """name -> instance of the entries, leaving out the weakly referenced instances already garbage collected."""
+    return {entry.name: instance for entry in entries if (instance := entry.instance) is not None or not entry.weak}
 
 
 def _apply_post_init(instance):
     post_init = getattr(instance, "_post_init", None)
     if callable(post_init):
+        if inspect.iscoroutinefunction(post_init):
+            raise AsyncInitializationRequired(f"The _post_init of {instance.__class__} is a coroutine function, "
+                                              f"the Component has to be created with Component.acreate")
         instance._post_init()
+
+
+async def _apply_post_init_async(instance):
+    post_init = getattr(instance, "_post_init", None)
+    if callable(post_init):
+        result = instance._post_init()
+        if inspect.isawaitable(result):
+            await result
+
+
+def _apply_post_fork(instance):
+    post_fork = getattr(instance, "_post_fork", None)
+    if callable(post_fork):
+        result = instance._post_fork()
+        if inspect.isawaitable(result):
+            asyncio.run(_await(result))
+
+
+def _apply_pre_destroy(instance):
+    pre_destroy = getattr(instance, "_pre_destroy", None)
+    if callable(pre_destroy):
+        result = instance._pre_destroy()
+        if inspect.isawaitable(result):
+            _run_pre_destroy_awaitable(instance, result)
+
+
+# tasks of the coroutine _pre_destroy scheduled by _run_pre_destroy_awaitable, kept until done so they aren't collected
+_pre_destroy_tasks = set()
+
+
+def _run_pre_destroy_awaitable(instance, awaitable) -> None:
+    """Run the awaitable returned by a _pre_destroy called synchronously.
+
+    Without a running event loop, it is run to completion with asyncio.run. A synchronous call from a coroutine (a
+    get evicting an expired instance, release_thread_scope, ...) can't use asyncio.run, nor wait for the awaitable
+    without blocking the loop it runs in: it is scheduled as a task of the running loop instead, and a failure logged.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(_await(awaitable))
+        return
+
+    def done(task: asyncio.Task):
+        _pre_destroy_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.warning("(pre_destroy) _pre_destroy of %r failed: %r", instance, task.exception())
+
+    task = loop.create_task(_await(awaitable))
+    _pre_destroy_tasks.add(task)
+    task.add_done_callback(done)
+
+
+async def _apply_pre_destroy_async(instance):
+    pre_destroy = getattr(instance, "_pre_destroy", None)
+    if callable(pre_destroy):
+        if inspect.iscoroutinefunction(pre_destroy):
+            await pre_destroy()
+        else:
+            result = await asyncio.wrap_future(_run_in_daemon_thread(pre_destroy))
+            if inspect.isawaitable(result):
+                await result
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+class _Anchor(metaclass=Component):
+    """This is a dummy class only to enable access to the metaclass inner field through it."""
+    pass
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=Component._before_fork, after_in_parent=Component._after_fork_in_parent,
+                        after_in_child=Component._after_fork_in_child)
@@ -1,12 +1,19 @@
 from functools import wraps
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+# attribute of the decorated __init__ containing, for each autowire decorator, the list of (field, [instance names])
+AUTOWIRE_ATTRIBUTE = "__autowire__"
 
 
 def autowire(**kwargs):
     """autowire annotation to be placed on top of __init__ method
 
-    This decorator, by itself, doesn't do anything. However, it is used inside
-    the Component creation where the arguments of this decorator are used
-    to retrieve which instance has to be injected inside the new Component.
+    This decorator, by itself, doesn't do anything. However, it records its arguments
+    on the decorated function (see AUTOWIRE_ATTRIBUTE) and they are read by the Component
+    metaclass, when the class is created, to know which instance has to be injected
+    inside the new Component.
 
     InDepth:
     --------
@@ -32,10 +39,64 @@ def autowire(**kwargs):
     :param kwargs: the parameter used for autowire instance mapping
     :return: the return of the __init__ method
     """
+    mapping = [(name, [value] if isinstance(value, str) else list(value)) for name, value in kwargs.items()]
+
     def decorator_autowire(init):
         @wraps(init)
         def wrapper_decorator(*init_args, **init_kwargs):
             instance = init(*init_args, **init_kwargs)
             return instance
+        # the outermost decorator comes first, as it is written in the source. A new list is created
+        # since wraps copies (by reference) the attributes of the decorated function
+        setattr(wrapper_decorator, AUTOWIRE_ATTRIBUTE, [mapping, *getattr(init, AUTOWIRE_ATTRIBUTE, [])])
         return wrapper_decorator
     return decorator_autowire
+
+
+class Lazy(Generic[T]):
+    """Annotation marking a Component field to be autowired lazily
+
+    Instead of the Component itself, a lightweight proxy is injected. The actual Component
+    is retrieved on the first access to one of its attributes, and then cached in the proxy.
+    The dependency doesn't have to exist when the Component holding the field is created.
+
+    InDepth:
+    --------
+
+    class InDepth(metaclass=Component)
+
+        report_service: Lazy[ReportService]
+
+        @autowire(report_service="monthly")
+        def __init__(self):
+            pass
+
+    ReportService is only looked for (with the instance name "monthly") the first time
+    self.report_service is used.
+
+    Only single Component can be lazy, not List[...] or Dict[str, ...].
+    """
+
+
+class Live(Generic[T]):
+    """Annotation marking a collection of Component (List[...] or Dict[str, ...]) to be autowired as a live view
+
+    Instead of a copy of the instances existing when the Component is created, a read only view
+    over the container is injected. It doesn't copy anything and always reflects the registered
+    instances: the ones created (or deleted) later are visible as well.
+
+    InDepth:
+    --------
+
+    class InDepth(metaclass=Component)
+
+        plugins: Live[List[Plugin]]
+        handlers: Live[Dict[str, Handler]]
+
+        @autowire(handlers=["http", "grpc"])
+        def __init__(self):
+            pass
+
+    self.plugins always contains all the instances of Plugin, self.handlers the instances of
+    Handler named "http" or "grpc" once they exist.
+    """
@@ -0,0 +1,15 @@
+from typing import List
+
+from deafadder_container.MetaTemplate import Component
+
+
+class _Plugin(metaclass=Component):
+    pass
+
+
+class _PluginHost(metaclass=Component):
+    plugins: List[_Plugin]
+
+
+class _NotAComponent:
+    pass
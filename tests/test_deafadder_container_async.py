@@ -0,0 +1,127 @@
+import asyncio
+import threading
+
+import pytest
+
+from deafadder_container.ContainerException import AsyncInitializationRequired, InstanceNotFound
+from deafadder_container.MetaTemplate import Component, Scope
+from deafadder_container.Wiring import autowire
+
+
+@pytest.fixture(autouse=True)
+def purge_component_fixture():
+    yield
+    Component.purge()
+
+
+class _AsyncDatabase(metaclass=Component):
+    created: int = 0
+
+    async def _post_init(self):
+        await asyncio.sleep(0.05)
+        _AsyncDatabase.created += 1
+        self.connected = True
+
+
+class _AsyncCache(metaclass=Component):
+
+    async def _post_init(self):
+        await asyncio.sleep(0.05)
+        self.connected = True
+
+
+class _AsyncRepository(metaclass=Component):
+    database: _AsyncDatabase
+    cache: _AsyncCache
+    other_cache: _AsyncCache
+
+    @autowire(other_cache="other")
+    def __init__(self):
+        pass
+
+    def _post_init(self):
+        self.ready = self.database.connected and self.cache.connected and self.other_cache.connected
+
+
+def test_acreate_awaits_post_init_and_creates_dependencies_concurrently():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        repository = await Component.acreate(_AsyncRepository)
+        return repository, loop.time() - start
+
+    repository, elapsed = asyncio.run(scenario())
+
+    assert repository.ready
+    assert repository.database is Component.get(_AsyncDatabase)
+    assert repository.cache is Component.get(_AsyncCache)
+    assert repository.other_cache is Component.get(_AsyncCache, "other")
+    assert repository.cache is not repository.other_cache
+    # the three dependencies sleep 0.05s each, concurrently
+    assert elapsed < 0.14
+
+
+def test_concurrent_acreate_build_the_singleton_once():
+    _AsyncDatabase.created = 0
+
+    async def scenario():
+        return await asyncio.gather(*(Component.acreate(_AsyncDatabase) for _ in range(10)))
+
+    instances = asyncio.run(scenario())
+
+    assert all(i is instances[0] for i in instances)
+    assert _AsyncDatabase.created == 1
+
+
+_destroyed = []
+
+
+class _RacedClient(metaclass=Component):
+
+    def __init__(self, race: bool = False):
+        if race:
+            # a synchronous creation from another thread registers its instance while this one is being built
+            thread = threading.Thread(target=_RacedClient)
+            thread.start()
+            thread.join()
+
+    async def _pre_destroy(self):
+        _destroyed.append(self)
+
+
+def test_instance_built_by_acreate_concurrently_with_a_sync_creation_is_destroyed():
+    _destroyed.clear()
+
+    instance = asyncio.run(Component.acreate(_RacedClient, race=True))
+
+    assert instance is Component.get(_RacedClient)
+    assert len(_destroyed) == 1 and _destroyed[0] is not instance
+
+
+def test_aget_waits_for_pending_creation():
+    async def scenario():
+        creation = asyncio.ensure_future(Component.acreate(_AsyncCache))
+        await asyncio.sleep(0)
+        return await Component.aget(_AsyncCache), await creation
+
+    fetched, created = asyncio.run(scenario())
+
+    assert fetched is created
+
+
+def test_aget_fails_when_instance_does_not_exist():
+    with pytest.raises(InstanceNotFound):
+        asyncio.run(Component.aget(_AsyncCache))
+
+
+def test_acreate_prototype_is_not_registered():
+    instance = asyncio.run(Component.acreate(_AsyncCache, scope=Scope.PROTOTYPE))
+
+    assert instance.connected
+    with pytest.raises(InstanceNotFound):
+        Component.get(_AsyncCache)
+
+
+def test_sync_creation_fails_with_async_post_init():
+    with pytest.raises(AsyncInitializationRequired):
+        _ = _AsyncCache()
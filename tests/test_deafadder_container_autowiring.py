@@ -3,9 +3,10 @@ from typing import List, Dict
 
 import pytest
 
-from deafadder_container.ContainerException import AnnotatedDeclarationMissing, MultipleAutowireReference, InstanceNotFound
-from deafadder_container.MetaTemplate import Component
-from deafadder_container.Wiring import autowire
+from deafadder_container.ContainerException import AnnotatedDeclarationMissing, MultipleAutowireReference, InstanceNotFound, \
+    InvalidAnnotation
+from deafadder_container.MetaTemplate import Component, Scope, _AutowireMechanism
+from deafadder_container.Wiring import autowire, Lazy, Live
 
 
 @pytest.fixture(autouse=True)
@@ -332,3 +333,323 @@ def test_list_autowire(dummy3_default, dummy3_non_default_1, dummy3_non_default_
 
     assert "non default 1" in instance.d
     assert "default" in instance.d
+
+
+def test_wiring_plan_is_computed_once_per_class(dummy3_default, dummy3_non_default_1, dummy3_non_default_2, monkeypatch):
+    _ = _Dummy5(scope=Scope.PROTOTYPE)
+    plan = _AutowireMechanism.plan_for(_Dummy5)
+
+    def fail_parsing(_):
+        raise AssertionError("the autowire decorators should not be read again")
+
+    monkeypatch.setattr(_AutowireMechanism, "_get_init_decorators", staticmethod(fail_parsing))
+    instances = [_Dummy5(scope=Scope.PROTOTYPE) for _ in range(3)]
+
+    assert _AutowireMechanism.plan_for(_Dummy5) is plan
+    assert all(i.service5 is dummy3_non_default_1 for i in instances)
+    assert all(i.service6 is dummy3_non_default_2 for i in instances)
+
+
+class NormalClassRegisteredLater:
+    pass
+
+
+class ComponentClassWithLateDependency(metaclass=Component):
+
+    late_ref: NormalClassRegisteredLater
+
+
+def test_wiring_plan_is_invalidated_when_registry_changes():
+    first = ComponentClassWithLateDependency(scope=Scope.PROTOTYPE)
+    assert not hasattr(first, "late_ref")
+
+    dependency = Component.of(NormalClassRegisteredLater())
+    second = ComponentClassWithLateDependency(scope=Scope.PROTOTYPE)
+    assert second.late_ref is dependency
+
+    Component.delete(NormalClassRegisteredLater)
+    third = ComponentClassWithLateDependency(scope=Scope.PROTOTYPE)
+    assert not hasattr(third, "late_ref")
+
+
+class NormalClassNotChecked:
+    pass
+
+
+class ComponentClassWithPlainAnnotations(metaclass=Component):
+
+    retries: int
+    late_ref: NormalClassRegisteredLater
+
+
+def test_wiring_plan_is_only_invalidated_by_the_classes_it_checked():
+    plan = _AutowireMechanism.plan_for(ComponentClassWithPlainAnnotations)
+
+    Component.of(NormalClassNotChecked())
+    _Dummy1()
+
+    assert _AutowireMechanism.plan_for(ComponentClassWithPlainAnnotations) is plan
+
+    Component.of(NormalClassRegisteredLater())
+
+    assert _AutowireMechanism.plan_for(ComponentClassWithPlainAnnotations) is not plan
+
+
+class _HeavyDependency(metaclass=Component):
+
+    def __init__(self):
+        self.value = 42
+
+    def compute(self):
+        return self.value * 2
+
+
+class LazyAutowireClass(metaclass=Component):
+    heavy: Lazy[_HeavyDependency]
+    named_heavy: Lazy[_HeavyDependency]
+
+    @autowire(named_heavy="named")
+    def __init__(self):
+        pass
+
+
+def test_lazy_autowire_does_not_require_the_dependency_to_exist():
+    instance = LazyAutowireClass()
+
+    heavy = _HeavyDependency()
+    assert instance.heavy.compute() == 84
+    assert instance.heavy.value == 42
+    instance.heavy.value = 1
+    assert heavy.value == 1
+
+    with pytest.raises(InstanceNotFound):
+        instance.named_heavy.compute()
+    named = _HeavyDependency(instance_name="named")
+    named.value = 2
+    assert instance.named_heavy.compute() == 4
+
+
+def test_lazy_proxy_caches_the_resolved_instance():
+    instance = LazyAutowireClass()
+    heavy = _HeavyDependency()
+    assert instance.heavy.value == 42
+
+    Component.delete(_HeavyDependency)
+
+    assert instance.heavy.value == 42
+    assert repr(instance.heavy) == repr(heavy)
+
+
+def test_explicit_autowire_with_aliased_decorator(dummy3_default, dummy3_non_default_1):
+    from deafadder_container import Wiring
+    from deafadder_container.Wiring import autowire as inject
+
+    class AliasedAutowireClass(metaclass=Component):
+        service1: _Dummy3
+        service2: _Dummy3
+
+        @inject(service1="non default 1")
+        @Wiring.autowire(service2="non default 1")
+        def __init__(self):
+            pass
+
+    instance = AliasedAutowireClass()
+
+    assert instance.service1 is dummy3_non_default_1
+    assert instance.service2 is dummy3_non_default_1
+
+
+def test_explicit_autowire_for_class_without_source(dummy3_default, dummy3_non_default_2):
+    namespace = {"Component": Component, "autowire": autowire, "_Dummy3": _Dummy3}
+    exec(
+        "class GeneratedClass(metaclass=Component):\n"
+        "    service: _Dummy3\n"
+        "    other_service: _Dummy3\n"
+        "\n"
+        "    @autowire(service='non default 2')\n"
+        "    def __init__(self):\n"
+        "        pass\n",
+        namespace
+    )
+
+    instance = namespace["GeneratedClass"]()
+
+    assert instance.service is dummy3_non_default_2
+    assert instance.other_service is dummy3_default
+
+
+class ForwardReferenceClass(metaclass=Component):
+    service: "_DefinedAfterForwardReferenceClass"
+    services: List["_DefinedAfterForwardReferenceClass"]
+
+
+class _DefinedAfterForwardReferenceClass(metaclass=Component):
+    pass
+
+
+def test_wiring_plan_is_computed_when_class_is_defined():
+    class DefinedInTest(metaclass=Component):
+        service1: _Dummy1
+        services: List[_Dummy1]
+
+    plan = _AutowireMechanism._plans.get(DefinedInTest)
+
+    assert plan is not None
+    assert [c.attribute_name for c in plan.default_candidates] == ["service1", "services"]
+    assert plan.epoch is None
+
+
+def test_forward_references_are_resolved_on_first_instantiation():
+    dependency = _DefinedAfterForwardReferenceClass()
+
+    instance = ForwardReferenceClass()
+
+    assert instance.service is dependency
+    assert instance.services == [dependency]
+
+
+class NeverDefinedForwardReferenceClass(metaclass=Component):
+    service: "_NeverDefined"  # noqa: F821
+    services: List["_DefinedAfterForwardReferenceClass"]
+
+
+def test_unresolved_forward_reference_is_reported(caplog):
+    dependency = _DefinedAfterForwardReferenceClass()
+
+    instance = NeverDefinedForwardReferenceClass()
+
+    assert not hasattr(instance, "service")
+    assert instance.services == [dependency]
+    assert "service" in caplog.text and "can't be resolved" in caplog.text
+
+
+def test_invalid_forward_reference_is_rejected():
+    with pytest.raises(InvalidAnnotation):
+        class _InvalidForwardReference(metaclass=Component):
+            service: "List[_Dummy1"  # noqa: F722
+
+
+class LiveCollectionClass(metaclass=Component):
+    all_services: Live[List[_Dummy3]]
+    named_services: Live[Dict[str, _Dummy3]]
+
+    @autowire(named_services=["non default 1", "non default 2"])
+    def __init__(self):
+        pass
+
+
+def test_live_collection_reflects_later_registrations(dummy3_default):
+    instance = LiveCollectionClass()
+    other = LiveCollectionClass(instance_name="other")
+
+    assert list(instance.all_services) == [dummy3_default]
+    assert dict(instance.named_services) == {}
+
+    non_default_1 = _Dummy3(instance_name="non default 1")
+    _ = _Dummy3(instance_name="ignored")
+
+    assert len(instance.all_services) == 3
+    assert instance.all_services[1] is non_default_1
+    assert dict(instance.named_services) == {"non default 1": non_default_1}
+    assert "non default 1" in instance.named_services
+
+    Component.delete(_Dummy3)
+    assert dummy3_default not in list(instance.all_services)
+
+    # the views are shared, not copied for each consumer
+    assert other.all_services is instance.all_services
+    assert other.named_services is instance.named_services
+
+
+def test_live_single_component_is_rejected():
+    with pytest.raises(InvalidAnnotation):
+        class _InvalidLive(metaclass=Component):
+            service: Live[_Dummy1]
+
+
+def test_lazy_collection_is_rejected():
+    with pytest.raises(InvalidAnnotation):
+        class _InvalidLazyList(metaclass=Component):
+            services: Lazy[List[_Dummy1]]
+    with pytest.raises(InvalidAnnotation):
+        class _InvalidLazyDict(metaclass=Component):
+            services: Lazy[Dict[str, _Dummy1]]
+
+
+def test_live_collection_is_emptied_by_purge(dummy3_default):
+    instance = LiveCollectionClass()
+    views = instance.all_services
+
+    Component.purge()
+
+    assert len(views) == 0
+
+
+class CompiledInjectorClass(metaclass=Component):
+    service1: _Dummy1
+    service3: _Dummy3
+    named: _Dummy3
+    services: List[_Dummy3]
+    lazy: Lazy[_Dummy1]
+    already_set: _Dummy1
+
+    @autowire(named="non default 1")
+    def __init__(self):
+        self.already_set = None
+
+
+def test_compiled_injector_matches_interpreted_autowiring(dummy3_default, dummy3_non_default_1):
+    compiled, interpreted = CompiledInjectorClass.__new__(CompiledInjectorClass), CompiledInjectorClass.__new__(CompiledInjectorClass)
+    compiled.__init__()
+    interpreted.__init__()
+
+    dependencies = _AutowireMechanism.inject(compiled, CompiledInjectorClass, "<prototype>")
+
+    assert _AutowireMechanism.plan_for(CompiledInjectorClass).injector is not None
+    assert dependencies == _AutowireMechanism(interpreted, CompiledInjectorClass, "<prototype>").apply()
+    assert dependencies == [(_Dummy1, "default"), (_Dummy3, "default"), (_Dummy3, "default"), (_Dummy3, "non default 1"),
+                            (_Dummy3, "non default 1")]
+    for field in ("service1", "service3", "named", "services", "already_set"):
+        assert getattr(compiled, field) == getattr(interpreted, field)
+    assert compiled.lazy.get_one() == 1
+    assert compiled.already_set is None
+
+
+def test_compiled_injector_is_cached_with_the_plan(dummy3_default, dummy3_non_default_1, monkeypatch):
+    _ = CompiledInjectorClass(scope=Scope.PROTOTYPE)
+    injector = _AutowireMechanism.plan_for(CompiledInjectorClass).injector
+
+    def fail_compilation(_):
+        raise AssertionError("the injector should not be compiled again")
+
+    monkeypatch.setattr(_AutowireMechanism, "compile", staticmethod(fail_compilation))
+    _ = CompiledInjectorClass(scope=Scope.PROTOTYPE)
+
+    assert _AutowireMechanism.plan_for(CompiledInjectorClass).injector is injector
+
+
+class CompiledInjectorWithLateDependencyClass(metaclass=Component):
+    service1: _Dummy1
+    late_ref: NormalClassRegisteredLater
+
+
+def test_compiled_injector_is_kept_when_the_wiring_does_not_change(dummy1_default, monkeypatch):
+    _ = CompiledInjectorWithLateDependencyClass(scope=Scope.PROTOTYPE)
+    plan = _AutowireMechanism.plan_for(CompiledInjectorWithLateDependencyClass)
+
+    Component.of(NormalClassRegisteredLater())
+    Component.delete(NormalClassRegisteredLater)
+
+    def fail_compilation(_):
+        raise AssertionError("the injector should not be compiled again")
+
+    monkeypatch.setattr(_AutowireMechanism, "compile", staticmethod(fail_compilation))
+    _ = CompiledInjectorWithLateDependencyClass(scope=Scope.PROTOTYPE)
+
+    assert _AutowireMechanism.plan_for(CompiledInjectorWithLateDependencyClass) is not plan
+    assert _AutowireMechanism.plan_for(CompiledInjectorWithLateDependencyClass).injector is plan.injector
+
+
+def test_compiled_injector_raises_for_missing_dependency(dummy1_default):
+    with pytest.raises(InstanceNotFound):
+        CompiledInjectorClass(scope=Scope.PROTOTYPE)
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from deafadder_container.ContainerException import CircularDependency
+from deafadder_container.MetaTemplate import Component
+from deafadder_container.Wiring import autowire
+
+from . import deafadder_container_bootstrap_test_helper
+from .deafadder_container_bootstrap_test_helper import _Plugin, _PluginHost
+
+
+@pytest.fixture(autouse=True)
+def purge_component_fixture():
+    yield
+    Component.purge()
+
+
+class _SlowDatabase(metaclass=Component):
+
+    def _post_init(self):
+        time.sleep(0.1)
+
+
+class _SlowCache(metaclass=Component):
+
+    def _post_init(self):
+        time.sleep(0.1)
+
+
+class _Service(metaclass=Component):
+    database: _SlowDatabase
+    cache: _SlowCache
+    other_cache: _SlowCache
+
+    @autowire(other_cache="other")
+    def __init__(self):
+        pass
+
+
+class _CircularA(metaclass=Component):
+    b: "_CircularB"
+
+
+class _CircularB(metaclass=Component):
+    a: _CircularA
+
+
+def test_bootstrap_creates_dependencies_concurrently():
+    start = time.perf_counter()
+    timings = Component.bootstrap([_Service])
+    elapsed = time.perf_counter() - start
+
+    service = Component.get(_Service)
+    assert service.database is Component.get(_SlowDatabase)
+    assert service.cache is Component.get(_SlowCache)
+    assert service.other_cache is Component.get(_SlowCache, "other")
+
+    assert set(timings) == {(_Service, "default"), (_SlowDatabase, "default"), (_SlowCache, "default"), (_SlowCache, "other")}
+    assert timings[(_SlowDatabase, "default")] >= 0.1
+    # three sleeps of 0.1s done concurrently
+    assert elapsed < 0.25
+
+
+def test_bootstrap_skips_existing_instances():
+    database = _SlowDatabase()
+
+    timings = Component.bootstrap([_SlowDatabase, _SlowCache])
+
+    assert set(timings) == {(_SlowCache, "default")}
+    assert Component.get(_SlowDatabase) is database
+
+
+def test_bootstrap_module():
+    timings = Component.bootstrap(deafadder_container_bootstrap_test_helper)
+
+    assert set(timings) == {(_PluginHost, "default"), (_Plugin, "default")}
+    assert Component.get(_PluginHost).plugins == [Component.get(_Plugin)]
+
+
+def test_bootstrap_fails_on_circular_dependency():
+    with pytest.raises(CircularDependency):
+        Component.bootstrap([_CircularA])
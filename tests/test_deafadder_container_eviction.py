@@ -0,0 +1,122 @@
+import asyncio
+import time
+import warnings
+
+import pytest
+
+from deafadder_container.ContainerException import InstanceNotFound
+from deafadder_container.MetaTemplate import Component
+
+
+@pytest.fixture(autouse=True)
+def purge_component_fixture():
+    _destroyed.clear()
+    yield
+    Component.purge()
+
+
+_destroyed = []
+
+
+class _TenantClient(metaclass=Component, max_instances=2):
+
+    def _pre_destroy(self):
+        _destroyed.append(self)
+
+
+class _ExpiringClient(metaclass=Component, ttl=0.05):
+
+    def _pre_destroy(self):
+        _destroyed.append(self)
+
+
+def test_least_recently_used_instance_is_evicted():
+    first = _TenantClient("tenant-1")
+    second = _TenantClient("tenant-2")
+    assert _TenantClient("tenant-1") is first
+
+    third = _TenantClient("tenant-3")
+
+    assert Component.get_all(_TenantClient) == {"tenant-1": first, "tenant-3": third}
+    assert _destroyed == [second]
+    assert _TenantClient("tenant-2") is not second
+    assert Component.eviction_stats(_TenantClient) == {"size": 2, "lru": 2, "ttl": 0}
+
+
+def test_get_counts_as_an_access():
+    first = _TenantClient("tenant-1")
+    _TenantClient("tenant-2")
+
+    Component.get(_TenantClient, "tenant-1")
+    _TenantClient("tenant-3")
+
+    assert list(Component.get_all(_TenantClient)) == ["tenant-1", "tenant-3"]
+    assert Component.get(_TenantClient, "tenant-1") is first
+
+
+def test_idle_instance_expires():
+    client = _ExpiringClient("tenant")
+    assert _ExpiringClient("tenant") is client
+
+    time.sleep(0.06)
+
+    with pytest.raises(InstanceNotFound):
+        Component.get(_ExpiringClient, "tenant")
+    assert _destroyed == [client]
+    assert _ExpiringClient("tenant") is not client
+    assert Component.eviction_stats(_ExpiringClient) == {"size": 1, "lru": 0, "ttl": 1}
+
+
+def test_container_state_is_bounded_by_max_instances():
+    for index in range(50):
+        _TenantClient(f"tenant-{index}")
+
+    assert len(Component.get_all(_TenantClient)) == 2
+    # no creation lock is left behind for the evicted tenants
+    assert not [key for key in Component._creation_locks if key[0] is _TenantClient]
+
+
+class _AsyncTenantClient(metaclass=Component, max_instances=1, ttl=0.05):
+
+    async def _pre_destroy(self):
+        await asyncio.sleep(0)
+        _destroyed.append(self)
+
+
+def test_async_pre_destroy_of_evicted_instance():
+    async def create():
+        first = await Component.acreate(_AsyncTenantClient, "tenant-1")
+        second = await Component.acreate(_AsyncTenantClient, "tenant-2")
+        # awaited by acreate
+        assert _destroyed == [first]
+
+        await asyncio.sleep(0.06)
+        with pytest.raises(InstanceNotFound):
+            await Component.aget(_AsyncTenantClient, "tenant-2")
+        # scheduled in the running loop by the synchronous lookup
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert _destroyed == [first, second]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        asyncio.run(create())
+    assert Component.eviction_stats(_AsyncTenantClient) == {"size": 0, "lru": 1, "ttl": 1}
+
+
+def test_evict_idle_instances():
+    _ExpiringClient("tenant-1")
+    _ExpiringClient("tenant-2")
+    assert Component.evict(_ExpiringClient) == {}
+    time.sleep(0.06)
+
+    evicted = Component.evict(_ExpiringClient)
+
+    assert list(evicted) == ["tenant-1", "tenant-2"]
+    assert Component.get_all(_ExpiringClient) == {}
+
+
+def test_invalid_eviction_policy():
+    with pytest.raises(ValueError):
+        class _Invalid(metaclass=Component, max_instances=0):
+            pass
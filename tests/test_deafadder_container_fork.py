@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from deafadder_container.ContainerException import InstanceNotFound
+from deafadder_container.MetaTemplate import Component, ForkPolicy
+
+
+@pytest.fixture(autouse=True)
+def purge_component_fixture():
+    _post_forked.clear()
+    yield
+    Component.purge()
+
+
+@pytest.fixture
+def simulated_child():
+    """Restore what Component._after_fork_in_child replaces, once a test has called it in the pytest process."""
+    saved = {name: getattr(Component, name) for name in ("_lock", "_creation_locks", "_async_creations", "_pools")}
+    yield
+    for name, value in saved.items():
+        setattr(Component, name, value)
+
+
+_post_forked = []
+
+
+class _Settings(metaclass=Component):
+
+    def _post_fork(self):
+        _post_forked.append(self)
+
+
+class _Connection(metaclass=Component, fork_policy=ForkPolicy.RECREATE):
+    settings: _Settings
+
+    def _post_fork(self):
+        raise AssertionError("a recreated instance doesn't go through _post_fork")
+
+
+class _Cursor(metaclass=Component, fork_policy=ForkPolicy.DROP):
+    pass
+
+
+def test_fork_policies_are_applied_in_the_child(simulated_child):
+    settings = _Settings()
+    connection = _Connection(instance_name="primary", tags=["db"])
+    _Cursor()
+    lock = Component._lock
+
+    # what os.fork calls in the child process
+    Component._after_fork_in_child()
+
+    assert Component._lock is not lock
+    assert _post_forked == [settings]
+    assert _Settings() is settings
+    recreated = Component.get(_Connection, "primary")
+    assert recreated is not connection
+    assert recreated.settings is settings
+    assert Component.get_all(_Connection, tags=["db"]) == {"primary": recreated}
+    with pytest.raises(InstanceNotFound):
+        Component.get(_Cursor)
+
+
+def test_frozen_registry_stays_frozen_in_the_child(simulated_child):
+    _Settings()
+    connection = _Connection()
+    Component.freeze()
+    try:
+        Component._after_fork_in_child()
+
+        assert Component.is_frozen()
+        assert Component.get(_Connection) is not connection
+    finally:
+        Component.unfreeze()
+
+
+def test_invalid_fork_policy():
+    with pytest.raises(ValueError):
+        class _Invalid(metaclass=Component, fork_policy="share"):
+            pass
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork is not available on this platform")
+def test_fork():
+    settings = _Settings()
+    connection = _Connection()
+
+    pid = os.fork()
+    if pid == 0:
+        # child process: report through the exit code, pytest must not go on in the child
+        try:
+            ok = _post_forked == [settings] and Component.get(_Connection) is not connection
+            os._exit(0 if ok else 1)
+        except BaseException:
+            os._exit(2)
+
+    _, status = os.waitpid(pid, 0)
+
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    assert _post_forked == []
+    assert Component.get(_Connection) is connection
+    # the lock held while forking has been released in the parent
+    assert _Settings(instance_name="other") is not settings
@@ -0,0 +1,131 @@
+import asyncio
+import sys
+import threading
+
+import pytest
+
+from deafadder_container.ContainerException import InstanceNotFound, RegistryFrozen
+from deafadder_container.MetaTemplate import Component, QUERY_CACHE_SIZE, Scope
+
+
+@pytest.fixture(autouse=True)
+def purge_component_fixture():
+    _initialized.clear()
+    yield
+    Component.unfreeze()
+    Component.purge()
+
+
+_initialized = []
+
+
+class _Repository(metaclass=Component):
+
+    def __init__(self):
+        _initialized.append(self)
+
+
+class _Handler(metaclass=Component):
+    repository: _Repository
+
+
+class _NormalClass:
+    pass
+
+
+def test_frozen_registry_serves_lookups():
+    repository = _Repository()
+    handler = _Handler(tags=["http"])
+    other = _Handler(instance_name="other")
+
+    Component.freeze()
+
+    assert Component.is_frozen()
+    assert _Repository() is repository
+    assert Component.get(_Handler, "other") is other
+    assert Component.get_all(_Handler) == {"default": handler, "other": other}
+    assert Component.get_all(_Handler, tags=["http"]) == {"default": handler}
+    assert Component.get_all(_Handler, pattern="oth.*") == {"other": other}
+    with pytest.raises(InstanceNotFound):
+        Component.get(_Handler, "missing")
+
+
+def test_concurrent_filtered_lookups_on_frozen_registry():
+    _Repository()
+    handler = _Handler(tags=["http"])
+    Component.freeze()
+    errors = []
+    barrier = threading.Barrier(8, timeout=10)
+
+    def query(thread_index):
+        barrier.wait()
+        try:
+            for i in range(QUERY_CACHE_SIZE * 4):
+                assert Component.get_all(_Handler, tags=["http", f"t{thread_index}-{i}"]) == {"default": handler}
+        except Exception as error:
+            errors.append(error)
+
+    # switch threads as often as possible, so that they interleave inside the lookups
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=query, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert errors == []
+
+
+def test_frozen_registry_can_not_be_modified():
+    repository = _Repository()
+    Component.freeze()
+
+    with pytest.raises(RegistryFrozen):
+        _Repository(instance_name="other")
+    with pytest.raises(RegistryFrozen):
+        Component.of(_NormalClass())
+    with pytest.raises(RegistryFrozen):
+        Component.delete(_Repository)
+    with pytest.raises(RegistryFrozen):
+        Component.delete_all(_Repository)
+    with pytest.raises(RegistryFrozen):
+        Component.purge()
+    with pytest.raises(RegistryFrozen):
+        Component.shutdown()
+    with pytest.raises(RegistryFrozen):
+        asyncio.run(Component.acreate(_Repository, "other"))
+
+    # the missing singleton wasn't even built
+    assert _initialized == [repository]
+    assert Component.get_all(_Repository) == {"default": repository}
+    assert not Component.contains(_NormalClass)
+    assert _NormalClass not in Component._instances
+
+
+def test_other_scopes_work_while_frozen():
+    repository = _Repository()
+    Component.freeze()
+
+    prototype = _Handler(scope=Scope.PROTOTYPE)
+    with Component.context_scope():
+        scoped = _Handler(scope=Scope.CONTEXT)
+
+    assert prototype.repository is repository
+    assert scoped.repository is repository
+
+
+def test_unfreeze_restores_the_registry():
+    repository = _Repository()
+    Component.freeze()
+    Component.unfreeze()
+
+    handler = _Handler()
+    Component.delete(_Repository)
+
+    assert not Component.is_frozen()
+    assert handler.repository is repository
+    assert Component.get_all(_Repository) == {}
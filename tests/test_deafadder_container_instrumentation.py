@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from deafadder_container.ContainerException import InstanceNotFound
+from deafadder_container.Instrumentation import Instrumentation, MetricsCollector
+from deafadder_container.MetaTemplate import Component, Scope
+
+
+@pytest.fixture(autouse=True)
+def purge_component_fixture():
+    yield
+    Component.set_instrumentation(None)
+    Component.purge()
+
+
+class _Database(metaclass=Component):
+
+    def __init__(self):
+        time.sleep(0.002)
+
+
+class _Repository(metaclass=Component):
+    database: _Database
+
+    def _post_init(self):
+        time.sleep(0.02)
+
+
+_LABEL = f"{__name__}._Repository"
+
+
+def test_metrics_collector():
+    metrics = MetricsCollector()
+    Component.set_instrumentation(metrics)
+
+    _Database()
+    _Repository()
+    _Repository()
+    _ = _Repository(scope=Scope.PROTOTYPE)
+    Component.get(_Repository)
+    with pytest.raises(InstanceNotFound):
+        Component.get(_Repository, "other")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["get_hits"][_LABEL] == 2
+    assert snapshot["counters"]["get_misses"][_LABEL] == 2
+    post_init = snapshot["histograms"]["post_init_seconds"][_LABEL]
+    assert post_init["count"] == 2
+    assert post_init["sum"] >= 0.04
+    assert post_init["buckets"][0.01] == 0
+    assert post_init["buckets"]["+Inf"] == 2
+    assert snapshot["histograms"]["init_seconds"][f"{__name__}._Database"]["sum"] >= 0.002
+    assert snapshot["histograms"]["creation_seconds"][_LABEL]["count"] == 2
+
+
+def test_lock_contention():
+    metrics = MetricsCollector()
+    Component.set_instrumentation(metrics)
+    _Database()
+
+    threads = [threading.Thread(target=_Repository) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["lock_contentions"][_LABEL] >= 1
+    assert snapshot["histograms"]["lock_wait_seconds"][_LABEL]["sum"] > 0
+
+
+def test_default_instrumentation_is_not_called():
+    class _Failing(Instrumentation):
+        def increment(self, metric, component_class, value=1):
+            raise AssertionError("should not be called")
+
+    Component.set_instrumentation(Instrumentation())
+    _Database()
+    assert Component._instrumentation is None
+
+    Component.set_instrumentation(_Failing())
+    with pytest.raises(AssertionError):
+        Component.get(_Database)
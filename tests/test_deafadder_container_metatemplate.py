@@ -582,3 +582,139 @@ def test_delete_all_with_tags_when_none_match(purge):
     assert Component.get(_FirstDummyClassForTest, "one") is instance_1
     assert Component.get(_FirstDummyClassForTest, "two") is instance_2
     assert Component.get(_FirstDummyClassForTest, "three") is instance_3
+
+
+def test_tag_index_is_updated_on_delete(purge):
+    _ = _FirstDummyClassForTest(instance_name="one", tags=["first", "second"])
+    instance_2 = _FirstDummyClassForTest(instance_name="two", tags=["second"])
+
+    Component.delete(_FirstDummyClassForTest, "one")
+
+    assert Component.get_all(_FirstDummyClassForTest, tags=["first"]) == {}
+    assert Component.get_all(_FirstDummyClassForTest, tags=["second"]) == {"two": instance_2}
+
+
+def test_tag_index_is_kept_on_partial_delete_all(purge):
+    _ = _FirstDummyClassForTest(instance_name="one", tags=["first"])
+    instance_2 = _FirstDummyClassForTest(instance_name="two", tags=["second"])
+
+    Component.delete_all(_FirstDummyClassForTest, names=["one"])
+
+    assert Component.get_all(_FirstDummyClassForTest, tags=["second"]) == {"two": instance_2}
+
+
+def test_get_all_keeps_creation_order_with_many_instances(purge):
+    names = [f"tenant-{i}" for i in range(200)]
+    for name in reversed(names):
+        _FirstDummyClassForTest(instance_name=name)
+
+    assert list(Component.get_all(_FirstDummyClassForTest)) == list(reversed(names))
+    assert Component.get(_FirstDummyClassForTest, "tenant-42") is Component.get_all(_FirstDummyClassForTest)["tenant-42"]
+
+
+def test_singleton_is_created_once_when_called_from_many_threads(purge):
+    import threading
+
+    barrier = threading.Barrier(8)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(_SecondDummyClassForTest())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8
+    assert all(r is results[0] for r in results)
+    assert len(Component.get_all(_SecondDummyClassForTest)) == 1
+
+
+def test_get_all_memoized_result_is_invalidated_on_registration(purge):
+    instance_1 = _FirstDummyClassForTest(instance_name="one", tags=["tenant"])
+
+    first = Component.get_all(_FirstDummyClassForTest, tags=["tenant"])
+    first["hijacked"] = None
+    assert Component.get_all(_FirstDummyClassForTest, tags=["tenant"]) == {"one": instance_1}
+
+    instance_2 = _FirstDummyClassForTest(instance_name="two", tags=["tenant"])
+    assert Component.get_all(_FirstDummyClassForTest, tags=["tenant"]) == {"one": instance_1, "two": instance_2}
+
+    Component.delete(_FirstDummyClassForTest, "one")
+    assert Component.get_all(_FirstDummyClassForTest, tags=["tenant"]) == {"two": instance_2}
+
+
+def test_get_all_combined_query_keeps_creation_order(purge):
+    instances = {name: _FirstDummyClassForTest(instance_name=name, tags=[name[0]]) for name in ["c1", "a1", "b1", "a2", "c2"]}
+
+    result = Component.get_all(_FirstDummyClassForTest, pattern="b", names=["c2", "unknown"], tags=["a"])
+
+    assert list(result) == ["a1", "b1", "a2", "c2"]
+    assert all(result[name] is instances[name] for name in result)
+
+
+def test_delete_all_returns_deleted_instances_and_keeps_tag_index_of_others(purge):
+    instance_1 = _FirstDummyClassForTest(instance_name="one", tags=["one", "shared"])
+    instance_2 = _FirstDummyClassForTest(instance_name="two", tags=["two", "shared"])
+
+    deleted = Component.delete_all(_FirstDummyClassForTest, tags=["one"])
+
+    assert deleted == {"one": instance_1}
+    assert Component.get_all(_FirstDummyClassForTest, tags=["shared"]) == {"two": instance_2}
+    assert Component.delete(_FirstDummyClassForTest, "two") is instance_2
+    assert Component.delete_all(_FirstDummyClassForTest) == {}
+
+
+def test_delete_all_many_instances(purge):
+    instances = {f"tenant-{i}": _FirstDummyClassForTest(instance_name=f"tenant-{i}", tags=[f"shard-{i % 2}"]) for i in range(5000)}
+
+    deleted = Component.delete_all(_FirstDummyClassForTest, tags=["shard-0"])
+
+    assert len(deleted) == 2500
+    assert all(deleted[name] is instances[name] for name in deleted)
+    assert len(Component.get_all(_FirstDummyClassForTest)) == 2500
+    assert Component.get_all(_FirstDummyClassForTest, tags=["shard-0"]) == {}
+
+
+def test_purge_returns_deleted_instances():
+    instance_1 = _FirstDummyClassForTest()
+    instance_2 = _SecondDummyClassForTest(instance_name="other")
+
+    deleted = Component.purge()
+
+    assert deleted == {_FirstDummyClassForTest: {"default": instance_1}, _SecondDummyClassForTest: {"other": instance_2}}
+    assert Component.purge() == {}
+
+
+def test_registry_entries_are_compact(purge):
+    _ = _FirstDummyClassForTest(tags=["tag"])
+
+    entry = Component._instances[_FirstDummyClassForTest]["default"]
+
+    assert not hasattr(entry, "__dict__")
+    assert entry.tags == ("tag",)
+    assert entry.dependencies == ()
+
+
+class _ReentrantDummyClass(metaclass=Component):
+    destroyed = []
+
+    def __init__(self, nested: bool = False):
+        if not nested:
+            # creates (and registers) the same instance during its own initialization
+            _ReentrantDummyClass(nested=True)
+
+    def _pre_destroy(self):
+        _ReentrantDummyClass.destroyed.append(self)
+
+
+def test_instance_built_while_another_one_is_registered_is_destroyed(purge):
+    _ReentrantDummyClass.destroyed.clear()
+
+    instance = _ReentrantDummyClass()
+
+    assert instance is Component.get(_ReentrantDummyClass)
+    assert len(_ReentrantDummyClass.destroyed) == 1 and _ReentrantDummyClass.destroyed[0] is not instance
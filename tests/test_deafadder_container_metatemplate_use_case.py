@@ -1,5 +1,6 @@
 import pytest
 import logging
+import threading
 
 from deafadder_container.ContainerException import InstanceNotFound
 from deafadder_container.MetaTemplate import Component, Scope
@@ -83,6 +84,25 @@ def test_logging(caplog):
             assert record.message == expected
 
 
+def test_trace(caplog, first_dummy_component):
+    Component.set_trace()
+    try:
+        with caplog.at_level(logging.DEBUG, logger="deafadder_container.MetaTemplate.trace"):
+            _ = _CompositeDummyClass3ForTest()
+            Component.delete(_CompositeDummyClass3ForTest)
+    finally:
+        Component.set_trace(False)
+
+    traces = [record.trace for record in caplog.records if hasattr(record, "trace")]
+    assert [t["event"] for t in traces] == ["get", "get", "inject", "create", "remove"]
+    assert traces[2]["field"] == "base_service"
+    assert traces[2]["dependency"] is _FirstDummyClassForTest
+    assert traces[2]["dependency_names"] == ["default"]
+    assert traces[3]["post_init_seconds"] >= 0
+    assert traces[4] == {"event": "remove", "component": _CompositeDummyClass3ForTest, "instance_names": ["default"]}
+    assert caplog.records[-1].getMessage().startswith("remove component=")
+
+
 def test_post_init(first_dummy_component):
     instance = _CompositeDummyClass3ForTest()
 
@@ -92,3 +112,71 @@ def test_post_init(first_dummy_component):
 
     assert instance.counter == 1
     assert first_dummy_component.counter == 2
+
+
+class _SlowComponent(metaclass=Component):
+
+    def _post_init(self):
+        _slow_post_init_started.set()
+        assert _slow_post_init_release.wait(timeout=5)
+
+
+class _FastComponent(metaclass=Component):
+    pass
+
+
+class _ComponentCreatingAnotherOne(metaclass=Component):
+
+    def __init__(self):
+        self.first = _FirstDummyClassForTest()
+
+
+_slow_post_init_started = threading.Event()
+_slow_post_init_release = threading.Event()
+
+
+def test_slow_post_init_does_not_block_unrelated_components():
+    slow_thread = threading.Thread(target=_SlowComponent)
+    slow_thread.start()
+    try:
+        assert _slow_post_init_started.wait(timeout=5)
+        fast = _FastComponent()
+        assert Component.get(_FastComponent) is fast
+        with pytest.raises(InstanceNotFound):
+            Component.get(_SlowComponent)
+    finally:
+        _slow_post_init_release.set()
+        slow_thread.join()
+
+    assert Component.get(_SlowComponent) is not None
+
+
+def test_component_can_create_another_component_during_init():
+    instance = _ComponentCreatingAnotherOne()
+
+    assert instance.first is Component.get(_FirstDummyClassForTest)
+
+
+_prototype_barrier = threading.Barrier(4)
+
+
+class _PrototypeWaitingForOthers(metaclass=Component):
+    base_service: _FirstDummyClassForTest
+
+    def __init__(self):
+        # only passes if the 4 instances are being created at the same time
+        _prototype_barrier.wait(timeout=5)
+
+
+def test_prototype_instances_are_created_concurrently(first_dummy_component):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(_PrototypeWaitingForOthers(scope=Scope.PROTOTYPE)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 4
+    assert len({id(r) for r in results}) == 4
+    assert all(r.base_service is first_dummy_component for r in results)
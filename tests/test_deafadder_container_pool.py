@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+
+from deafadder_container.ContainerException import InstanceNotFound, PoolExhausted
+from deafadder_container.MetaTemplate import Component, Scope
+
+
+@pytest.fixture(autouse=True)
+def purge_component_fixture():
+    yield
+    Component.purge()
+
+
+_created = []
+
+
+class _Dictionary(metaclass=Component):
+    pass
+
+
+class _Parser(metaclass=Component):
+    dictionary: _Dictionary
+
+    def __init__(self, encoding="utf-8"):
+        self.encoding = encoding
+        self.buffer = []
+        _created.append(self)
+
+    def _reset(self):
+        self.buffer.clear()
+
+
+class _Broken(metaclass=Component):
+
+    def _reset(self):
+        raise RuntimeError("can't reset")
+
+
+def test_pooled_instances_are_wired_once_and_recycled():
+    _created.clear()
+    dictionary = _Dictionary()
+
+    with _Parser(scope=Scope.POOLED) as first:
+        first.buffer.append("data")
+        assert first.dictionary is dictionary
+    with _Parser(scope=Scope.POOLED) as second:
+        assert second is first
+        assert second.buffer == []
+
+    assert len(_created) == 1
+    assert Component.pool_stats(_Parser) == {"size": 1, "idle": 1, "in_use": 0, "hits": 1, "misses": 1,
+                                             "waits": 0, "wait_time": 0.0}
+    assert Component.get_all(_Parser) == {}
+
+
+def test_pool_min_size_and_constructor_args():
+    _Dictionary()
+    Component.configure_pool(_Parser, "latin", min_size=2, max_size=3)
+
+    lease = _Parser("latin", Scope.POOLED, None, "latin-1")
+
+    assert Component.pool_stats(_Parser, "latin")["idle"] == 2
+    with lease as parser, _Parser("latin", Scope.POOLED) as other_parser:
+        assert parser.encoding == "latin-1"
+        assert other_parser is not parser
+    assert Component.pool_stats(_Parser, "latin")["hits"] == 2
+
+
+def test_pool_waits_for_a_release_when_full():
+    _Dictionary()
+    Component.configure_pool(_Parser, "bounded", max_size=1, timeout=1)
+    acquired = []
+
+    def use_parser():
+        with _Parser("bounded", Scope.POOLED) as parser:
+            acquired.append(parser)
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=use_parser) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = Component.pool_stats(_Parser, "bounded")
+    assert len({id(p) for p in acquired}) == 1
+    assert stats["size"] == 1
+    assert stats["waits"] == 2
+    assert stats["wait_time"] > 0
+
+
+def test_pool_exhausted():
+    _Dictionary()
+    Component.configure_pool(_Parser, "exhausted", max_size=1, timeout=0.01)
+
+    with _Parser("exhausted", Scope.POOLED):
+        with pytest.raises(PoolExhausted):
+            with _Parser("exhausted", Scope.POOLED):
+                pass
+
+
+def test_instance_failing_to_reset_is_discarded():
+    with _Broken(scope=Scope.POOLED) as first:
+        pass
+    with _Broken(scope=Scope.POOLED) as second:
+        assert second is not first
+        assert Component.pool_stats(_Broken)["size"] == 1
+
+    assert Component.pool_stats(_Broken)["size"] == 0
+
+
+def test_pool_stats_without_pool():
+    with pytest.raises(InstanceNotFound):
+        Component.pool_stats(_Parser, "unknown")
+
+
+def test_invalid_pool_size():
+    with pytest.raises(ValueError):
+        Component.configure_pool(_Parser, min_size=2, max_size=1)
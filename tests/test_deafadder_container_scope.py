@@ -0,0 +1,139 @@
+import asyncio
+import threading
+
+import pytest
+
+from deafadder_container.MetaTemplate import Component, Scope
+
+
+@pytest.fixture(autouse=True)
+def purge_component_fixture():
+    _released.clear()
+    yield
+    Component.purge()
+    Component.release_thread_scope()
+
+
+_released = []
+
+
+class _Database(metaclass=Component):
+    pass
+
+
+class _Session(metaclass=Component):
+    database: _Database
+
+    def _pre_destroy(self):
+        _released.append(self)
+
+
+class _AsyncSession(metaclass=Component):
+    database: _Database
+
+    async def _post_init(self):
+        await asyncio.sleep(0)
+
+    async def _pre_destroy(self):
+        await asyncio.sleep(0)
+        _released.append(self)
+
+
+def test_thread_scope_is_a_singleton_per_thread():
+    database = _Database()
+    session = _Session(scope=Scope.THREAD)
+    other_threads_sessions = []
+
+    def create_sessions():
+        first = _Session(scope=Scope.THREAD)
+        other_threads_sessions.append(first)
+        assert _Session(scope=Scope.THREAD) is first
+
+    threads = [threading.Thread(target=create_sessions) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert _Session(scope=Scope.THREAD) is session
+    assert _Session("other", scope=Scope.THREAD) is not session
+    assert session.database is database
+    assert len({id(s) for s in [session, *other_threads_sessions]}) == 3
+    assert Component.get_all(_Session) == {}
+
+
+def test_release_thread_scope():
+    _Database()
+    session = _Session(scope=Scope.THREAD)
+
+    results = Component.release_thread_scope()
+
+    assert results == {(_Session, "default"): None}
+    assert _released == [session]
+    assert _Session(scope=Scope.THREAD) is not session
+
+
+def test_release_thread_scope_from_a_coroutine():
+    async def release():
+        _Database()
+        session = _Session(scope=Scope.THREAD)
+        async_session = await Component.acreate(_AsyncSession, scope=Scope.THREAD)
+
+        Component.release_thread_scope()
+        # the coroutine _pre_destroy is scheduled in the running loop
+        for _ in range(3):
+            await asyncio.sleep(0)
+        return session, async_session
+
+    session, async_session = asyncio.run(release())
+
+    assert _released == [async_session, session] or _released == [session, async_session]
+
+
+def test_context_scope_releases_its_instances_on_exit():
+    _Database()
+    with Component.context_scope():
+        session = _Session(scope=Scope.CONTEXT)
+        assert _Session(scope=Scope.CONTEXT) is session
+        with Component.context_scope():
+            inner_session = _Session(scope=Scope.CONTEXT)
+            assert inner_session is not session
+        assert _released == [inner_session]
+        assert _Session(scope=Scope.CONTEXT) is session
+
+    assert _released == [inner_session, session]
+
+
+def test_context_scope_is_per_task_without_entered_scope():
+    _Database()
+
+    async def create_session():
+        session = _Session(scope=Scope.CONTEXT)
+        await asyncio.sleep(0)
+        assert _Session(scope=Scope.CONTEXT) is session
+        return session
+
+    async def main():
+        parent_session = _Session(scope=Scope.CONTEXT)
+        sessions = await asyncio.gather(*(create_session() for _ in range(3)))
+        return [parent_session, *sessions]
+
+    sessions = asyncio.run(main())
+
+    assert len({id(s) for s in sessions}) == 4
+
+
+def test_entered_context_scope_is_shared_with_child_tasks():
+    _Database()
+
+    async def main():
+        async with Component.context_scope():
+            session = await Component.acreate(_AsyncSession, scope=Scope.CONTEXT)
+            sessions = await asyncio.gather(*(Component.acreate(_AsyncSession, scope=Scope.CONTEXT) for _ in range(3)))
+            assert all(s is session for s in sessions)
+            assert _released == []
+        return session
+
+    session = asyncio.run(main())
+
+    assert _released == [session]
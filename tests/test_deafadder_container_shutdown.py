@@ -0,0 +1,183 @@
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from deafadder_container.MetaTemplate import Component, Scope
+from deafadder_container.Wiring import Lazy
+
+
+@pytest.fixture(autouse=True)
+def purge_component_fixture():
+    _destroyed.clear()
+    yield
+    Component.purge()
+
+
+_destroyed = []
+_destroyed_lock = threading.Lock()
+
+
+# set by the tests checking that the database and the cache are destroyed concurrently
+_meeting = None
+
+
+def _record(name):
+    with _destroyed_lock:
+        _destroyed.append(name)
+
+
+def _meet():
+    if _meeting is not None:
+        _meeting.wait()
+
+
+class _Database(metaclass=Component):
+
+    def _pre_destroy(self):
+        _meet()
+        _record("database")
+
+
+class _Cache(metaclass=Component):
+
+    def _pre_destroy(self):
+        _meet()
+        _record("cache")
+
+
+class _Repository(metaclass=Component):
+    database: _Database
+    cache: _Cache
+
+    def _pre_destroy(self):
+        _record("repository")
+
+
+class _AsyncClient(metaclass=Component):
+    repository: _Repository
+
+    async def _pre_destroy(self):
+        await asyncio.sleep(0.01)
+        _record("client")
+
+
+class _Stuck(metaclass=Component):
+
+    def _pre_destroy(self):
+        time.sleep(0.5)
+        _record("stuck")
+
+
+class _Failing(metaclass=Component):
+
+    def _pre_destroy(self):
+        raise RuntimeError("boom")
+
+
+class _LazyA(metaclass=Component):
+    b: Lazy["_LazyB"]
+
+    def _pre_destroy(self):
+        _record("a")
+
+
+class _LazyB(metaclass=Component):
+    a: _LazyA
+
+    def _pre_destroy(self):
+        _ = self.a
+        _record("b")
+
+
+def _create_graph():
+    _Database()
+    _Cache()
+    _Repository()
+    _AsyncClient()
+
+
+def test_shutdown_destroys_in_reverse_dependency_order(monkeypatch):
+    _create_graph()
+    _ = _Database(scope=Scope.PROTOTYPE)
+    # the database and the cache are destroyed concurrently: each one waits for the other one to be destroyed
+    monkeypatch.setitem(globals(), "_meeting", threading.Barrier(2, timeout=5))
+
+    results = Component.shutdown()
+
+    assert _destroyed[:2] == ["client", "repository"]
+    assert sorted(_destroyed[2:]) == ["cache", "database"]
+    assert all(error is None for error in results.values())
+    assert len(results) == 4
+    assert Component.get_all(_Database) == {}
+
+
+def test_shutdown_timeout_and_failure_do_not_stop_the_shutdown():
+    _Stuck()
+    _Failing()
+    _Database()
+
+    results = Component.shutdown(timeout=0.2)
+
+    assert isinstance(results[(_Stuck, "default")], TimeoutError)
+    assert isinstance(results[(_Failing, "default")], RuntimeError)
+    assert results[(_Database, "default")] is None
+    assert "stuck" not in _destroyed
+
+
+def test_shutdown_with_circular_lazy_dependency():
+    _LazyA()
+    _LazyB()
+
+    results = Component.shutdown()
+
+    assert set(results) == {(_LazyA, "default"), (_LazyB, "default")}
+    assert _destroyed == ["b", "a"]
+
+
+def test_ashutdown_destroys_in_reverse_dependency_order():
+    _create_graph()
+
+    results = asyncio.run(Component.ashutdown(timeout=1))
+
+    assert _destroyed[:2] == ["client", "repository"]
+    assert sorted(_destroyed[2:]) == ["cache", "database"]
+    assert all(error is None for error in results.values())
+
+
+def test_ashutdown_with_circular_lazy_dependency():
+    _LazyA()
+    _LazyB()
+
+    asyncio.run(Component.ashutdown())
+
+    assert _destroyed == ["b", "a"]
+
+
+_SLOW_SHUTDOWN_SCRIPT = """
+import asyncio
+import time
+from deafadder_container.MetaTemplate import Component
+
+
+class Slow(metaclass=Component):
+
+    def _pre_destroy(self):
+        time.sleep(5)
+
+
+Slow()
+errors = {shutdown}
+assert isinstance(errors[(Slow, "default")], TimeoutError)
+"""
+
+
+@pytest.mark.parametrize("shutdown", ["Component.shutdown(timeout=0.1)", "asyncio.run(Component.ashutdown(timeout=0.1))"])
+def test_timed_out_pre_destroy_does_not_block_exit(shutdown):
+    start = time.monotonic()
+    subprocess.run([sys.executable, "-c", _SLOW_SHUTDOWN_SCRIPT.format(shutdown=shutdown)], check=True, timeout=30)
+
+    assert time.monotonic() - start < 4
@@ -0,0 +1,136 @@
+import gc
+
+import pytest
+
+from deafadder_container.ContainerException import InstanceNotFound
+from deafadder_container.MetaTemplate import Component
+from deafadder_container.Wiring import Live
+from typing import List
+
+
+@pytest.fixture(autouse=True)
+def purge_component_fixture():
+    yield
+    Component.purge()
+
+
+class _Session(metaclass=Component, weak=True):
+    pass
+
+
+class _Config(metaclass=Component):
+    pass
+
+
+class _SlottedClass:
+    __slots__ = ("value",)
+
+
+class _SessionRegistry(metaclass=Component):
+    sessions: Live[List[_Session]]
+
+
+class _NormalClass:
+    pass
+
+
+def test_weak_class_instances_are_removed_once_unreferenced():
+    session = _Session("session-1", tags=["user"])
+    other_session = _Session("session-2", tags=["user"])
+
+    assert _Session("session-1") is session
+    assert Component.get_all(_Session, tags=["user"]) == {"session-1": session, "session-2": other_session}
+
+    del session
+    gc.collect()
+
+    with pytest.raises(InstanceNotFound):
+        Component.get(_Session, "session-1")
+    assert Component.get_all(_Session) == {"session-2": other_session}
+    assert Component.get_all(_Session, tags=["user"]) == {"session-2": other_session}
+
+    del other_session
+    gc.collect()
+
+    assert not Component.contains(_Session)
+    assert _Session not in Component._instances
+    assert _Session not in Component._tag_index
+
+
+def test_weak_instance_can_be_created_again():
+    _Session()
+    gc.collect()
+    assert not Component.contains(_Session)
+
+    session = _Session()
+
+    assert Component.get(_Session) is session
+    assert Component.get_all(_Session) == {"default": session}
+
+
+def test_strong_class_is_not_affected():
+    config = _Config()
+    config_id = id(config)
+    del config
+    gc.collect()
+
+    assert id(Component.get(_Config)) == config_id
+
+
+def test_weak_component_of():
+    instance = _NormalClass()
+    strong_instance = _NormalClass()
+    Component.of(instance, "weak", weak=True)
+    Component.of(strong_instance, "strong")
+
+    assert Component.of(_NormalClass(), "weak", weak=True) is instance
+
+    del instance, strong_instance
+    gc.collect()
+
+    assert list(Component.get_all(_NormalClass)) == ["strong"]
+
+
+def test_weak_component_of_not_weakly_referenceable_instance():
+    with pytest.raises(TypeError):
+        Component.of(_SlottedClass(), weak=True)
+
+    assert not Component.contains(_SlottedClass)
+    assert _SlottedClass not in Component._instances
+
+
+def test_live_view_does_not_keep_weak_instances_alive():
+    session = _Session("session")
+    registry = _SessionRegistry()
+    assert list(registry.sessions) == [session]
+
+    del session
+    gc.collect()
+
+    assert list(registry.sessions) == []
+    assert Component.get_all(_Session) == {}
+
+
+def test_instance_collected_while_the_lock_is_held():
+    session = _Session("session")
+
+    with Component._lock:
+        del session
+        gc.collect()
+        # the finalizer couldn't acquire the lock, the entry is removed later
+        assert "session" in Component._instances[_Session]
+
+    with pytest.raises(InstanceNotFound):
+        Component.get(_Session, "session")
+    _Config()
+    assert _Session not in Component._instances
+
+
+def test_container_state_is_released_with_collected_instances():
+    for index in range(50):
+        _Session(f"session-{index}", tags=["user"])
+    gc.collect()
+
+    assert Component.get_all(_Session) == {}
+    assert _Session not in Component._tag_index
+    assert not [key for key in Component._creation_locks if key[0] is _Session]